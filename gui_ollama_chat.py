@@ -9,19 +9,128 @@ short-turn truncation, threaded conversation loop, and persistent config.
 
 
 import os
+import re
 import json
 import time
 import queue
 import threading
+import concurrent.futures
 import urllib.request
+import collections
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from typing import Optional
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter.scrolledtext import ScrolledText
-from multi_ollama_chat import chat_with_ollama
-
+from multi_ollama_chat import chat_with_ollama, stream_chat_with_ollama
+
+
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PERSONAS_PATH = os.path.join(_MODULE_DIR, 'personas.json')
+DEFAULT_CONFIG = os.path.join(_MODULE_DIR, 'gui_config.json')
+
+
+class _DaemonPool:
+    """Minimal executor whose workers are daemon threads.
+
+    ThreadPoolExecutor joins its workers at interpreter exit, so a single stalled Ollama
+    call would keep the process alive after the window closes. Returns ordinary
+    concurrent.futures.Future objects, so result()/as_completed() work as usual.
+    """
+
+    def __init__(self, max_workers, name):
+        self._max_workers = max_workers
+        self._name = name
+        self._jobs = queue.SimpleQueue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, fn, *args, **kwargs):
+        fut = concurrent.futures.Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+            self._jobs.put((fut, fn, args, kwargs))
+            # Workers are started on demand up to max_workers and then reused
+            if len(self._threads) < self._max_workers:
+                t = threading.Thread(target=self._work, daemon=True, name=f'{self._name}_{len(self._threads)}')
+                self._threads.append(t)
+                t.start()
+        return fut
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            fut, fn, args, kwargs = job
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                fut.set_exception(e)
 
-DEFAULT_PERSONAS_PATH = os.path.join(os.path.dirname(__file__), 'personas.json')
-DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), 'gui_config.json')
+    def shutdown(self, wait=True, cancel_futures=False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        job = self._jobs.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is not None:
+                        job[0].cancel()
+            for _ in self._threads:
+                self._jobs.put(None)
+        if wait:
+            for t in self._threads:
+                t.join()
+
+
+# Shared workers for the connectivity probes
+_OLLAMA_POOL = _DaemonPool(4, 'ollama')
+# Chat calls get their own workers so probes can't delay them; timeouts are enforced on the socket by chat_with_ollama
+_CHAT_POOL = _DaemonPool(4, 'ollama-chat')
+# Per-endpoint model-list probes; 6 = three endpoints for each of the two _io_pool fetch jobs
+_MODELS_POOL = _DaemonPool(6, 'ollama-models')
+# Poll cadences (ms): fast while messages are flowing, slower after _QUEUE_IDLE_TICKS
+# empty ticks; connectivity backs off while servers answer and re-checks sooner after a failure
+_QUEUE_POLL_ACTIVE_MS = 10
+_QUEUE_POLL_IDLE_MS = 50
+_QUEUE_IDLE_TICKS = 5
+# Upper bound on messages handled in one _poll_queue tick
+_QUEUE_MAX_BATCH = 64
+_CONNECTIVITY_POLL_OK_MS = 5000
+_CONNECTIVITY_POLL_ERR_MS = 2000
+# Retry policy of the shared HTTP session (see _http_session) and the model-list request timeout
+_HTTP_RETRIES = 2
+_HTTP_BACKOFF = 0.5
+_MODELS_TIMEOUT = (1.5, 5)  # (connect, read)
+# Longest one model-list probe can take: every attempt times out, plus the backoff sleeps between them
+_MODELS_WAIT = ((1 + _HTTP_RETRIES) * sum(_MODELS_TIMEOUT)
+                + sum(_HTTP_BACKOFF * 2 ** i for i in range(_HTTP_RETRIES)) + 1)
+# Set BRAIN_DISABLE_TOOLTIPS=1 (CI/headless runs) to skip tooltip bindings entirely
+_TOOLTIPS_ENABLED = os.environ.get('BRAIN_DISABLE_TOOLTIPS') != '1'
+# Fields start() reads as stripped strings / ints to build the conversation config
+_START_STR_FIELDS = ('a_url', 'a_model', 'a_persona', 'a_age', 'a_quirk',
+                     'b_url', 'b_model', 'b_persona', 'b_age', 'b_quirk')
+_START_INT_FIELDS = ('turns', 'max_chars_a', 'max_chars_b')
+# Fields restored by load_config: (widget attribute, config key, coercion)
+_CONFIG_FIELDS = (
+    ('a_age', 'a_age', str),
+    ('b_age', 'b_age', str),
+    ('a_quirk', 'a_quirk', str),
+    ('b_quirk', 'b_quirk', str),
+    # preset selectors: both chat-tab and settings-tab controls
+    ('a_preset', 'a_preset', str),
+    ('b_preset', 'b_preset', str),
+    ('a_preset_settings', 'a_preset', str),
+    ('b_preset_settings', 'b_preset', str),
+)
 
 
 class Tooltip:
@@ -57,6 +166,239 @@ class Tooltip:
             self.tipwindow = None
 
 
+# Markdown-to-plain-text patterns used by the chat display (compiled once)
+_MD_BOLD = re.compile(r'\*\*(.*?)\*\*|__(.*?)__')
+_MD_ITALIC = re.compile(r'\*(.*?)\*|_(.*?)_')
+_MD_INLINE_CODE = re.compile(r'`([^`]*)`')
+_MD_CODEBLOCK = re.compile(r'```([\s\S]*?)```')
+_MD_LIST = re.compile(r'^[\s]*[-\*] (.*)', re.MULTILINE)
+_MD_HEADER = re.compile(r'^#+ (.*)', re.MULTILINE)
+_MD_QUOTE = re.compile(r'^> (.*)', re.MULTILINE)
+_TURN_RE = re.compile(r'Turn\s*(\d+)\s*/\s*(\d+)')
+# Short-turn truncation: first full sentence, else the text up to the first clause break
+_FIRST_SENT_RE = re.compile(r'(.+?[.!?])(\s|$)', re.S)
+_SPLIT_CLAUSE_RE = re.compile(r'[,;:\-]\s*')
+# A sentence terminator followed by more text: the streamed reply already holds its first sentence
+_SENT_END_RE = re.compile(r'[.!?]\s')
+
+
+def _format_markdown(md):
+    # Each pass only runs when its marker characters are present; most agent
+    # replies are plain prose and skip every regex.
+    # Bold: **text** or __text__
+    if '**' in md or '__' in md:
+        md = _MD_BOLD.sub(lambda m: m.group(1) or m.group(2), md)
+    # Italic: *text* or _text_
+    if '*' in md or '_' in md:
+        md = _MD_ITALIC.sub(lambda m: m.group(1) or m.group(2), md)
+    if '`' in md:
+        # Inline code: `code`
+        md = _MD_INLINE_CODE.sub(r'[code]\1[/code]', md)
+        # Code blocks: ```code```
+        md = _MD_CODEBLOCK.sub(r'\n[code]\1[/code]\n', md)
+    # Lists: - item or * item
+    if '- ' in md or '* ' in md:
+        md = _MD_LIST.sub(r'• \1', md)
+    # Headers: # Header
+    if '#' in md:
+        md = _MD_HEADER.sub(r'\1', md)
+    # Blockquotes: > quote
+    if '> ' in md:
+        md = _MD_QUOTE.sub(r'"\1"', md)
+    return md
+
+
+# Model-list payloads: a bare list, or a dict wrapping one under a container key
+_NAME_KEYS = ('name', 'model', 'id', 'modelId')
+_CONTAINER_KEYS = ('models', 'results', 'data')
+
+
+def _model_name(item):
+    return next((item[k] for k in _NAME_KEYS if item.get(k)), None)
+
+
+def _extract_model_names(data):
+    """Return the model names found in a decoded /models response."""
+    if isinstance(data, list):
+        names = (_model_name(it) if isinstance(it, dict) else str(it) for it in data)
+        return [n for n in names if n is not None]
+    if isinstance(data, dict):
+        names = [_model_name(it) for k in _CONTAINER_KEYS if isinstance(data.get(k), list)
+                 for it in data[k] if isinstance(it, dict)]
+        names = [n for n in names if n]
+        # Some servers return a flat {id: name} mapping instead
+        return names or [v for v in data.values() if isinstance(v, str)]
+    return []
+
+
+def _iter_ndjson(chunks):
+    """Yield each JSON object from an iterable of newline-delimited byte chunks."""
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        start = 0
+        # Split frames in place; json.loads takes bytes, so no per-line str decode
+        while (idx := buf.find(b'\n', start)) != -1:
+            # json.loads skips surrounding whitespace itself; blank lines just fail the parse
+            if idx > start:
+                try:
+                    yield json.loads(bytes(buf[start:idx]))
+                except ValueError:
+                    pass
+            start = idx + 1
+        del buf[:start]
+    if buf:
+        try:
+            yield json.loads(bytes(buf))
+        except ValueError:
+            pass
+
+
+def _error_text(resp):
+    """Return the 'error' field of an Ollama error response, else its raw body."""
+    # Parse the bytes directly; resp.json()/resp.text would run charset detection first
+    body = resp.content
+    try:
+        err = json.loads(body).get('error')
+    except (ValueError, AttributeError):
+        err = None
+    return err or body.decode(resp.encoding or 'utf-8', errors='replace') or f'HTTP {resp.status_code}'
+
+
+# Opening line of every conversation system prompt
+_TOPIC_INSTRUCTION = (
+    "Important: In every reply, explicitly reference the discussion topic and keep responses focused on it. "
+    "Begin each response by briefly restating the topic and avoid unrelated tangents."
+)
+
+
+def _build_persona(base, age, quirk):
+    return ' | '.join(p for p in (base, age and f"Age: {age}", quirk and f"Quirk: {quirk}") if p)
+
+
+def _system_prompt(name, peer, topic, persona, notes=''):
+    return f"{_TOPIC_INSTRUCTION} You are {name}. Discuss '{topic}' with {peer}. {persona}.{notes}".strip()
+
+
+# Cached [epoch_second, 'HH:MM:SS'] so bursts of status lines format the clock once per second
+_last_ts_sec = [0, '']
+
+
+def _now_hms():
+    now = int(time.time())
+    if now != _last_ts_sec[0]:
+        _last_ts_sec[0] = now
+        _last_ts_sec[1] = time.strftime('%H:%M:%S', time.localtime(now))
+    return _last_ts_sec[1]
+
+
+def _tooltip(widget, text):
+    """Attach a Tooltip unless tooltips are disabled for this run."""
+    if _TOOLTIPS_ENABLED:
+        return Tooltip(widget, text)
+    return None
+
+
+@dataclass(slots=True)
+class AgentRuntime:
+    """Per-agent sampling options sent with each chat request."""
+    temperature: float = 0.7
+    max_tokens: int = 512
+    top_p: float = 1.0
+    stop: list = field(default_factory=list)
+    stream: bool = False
+
+    @classmethod
+    def from_dict(cls, d):
+        d = d or {}
+        return cls(float(d.get('temperature', 0.7)), int(d.get('max_tokens', 512)), float(d.get('top_p', 1.0)),
+                   list(d.get('stop') or []), bool(d.get('stream', False)))
+
+    def options(self):
+        # chat_with_ollama kwargs for a conversation turn; an empty stop list is sent as None
+        return {'temperature': self.temperature, 'max_tokens': self.max_tokens, 'top_p': self.top_p,
+                'stop': self.stop or None, 'stream': self.stream}
+
+
+@dataclass(slots=True)
+class ConversationConfig:
+    """Snapshot of the GUI settings that a conversation run reads."""
+    a_url: str = ''
+    a_name: str = ''
+    a_model: str = ''
+    a_persona: str = ''
+    a_persona_file: str = ''
+    a_age: str = ''
+    a_quirk: str = ''
+    b_url: str = ''
+    b_name: str = ''
+    b_model: str = ''
+    b_persona: str = ''
+    b_persona_file: str = ''
+    b_age: str = ''
+    b_quirk: str = ''
+    topic: str = ''
+    turns: int = 10
+    delay: float = 1.0
+    humanize: bool = False
+    greeting: Optional[str] = None
+    user_name: Optional[str] = None
+    max_chars_a: int = 120
+    max_chars_b: int = 120
+    short_turn: bool = False
+    log: bool = False
+    log_path: Optional[str] = None
+    merge_final: bool = False
+    # Turns of chat history (one exchange = 2 messages) resent with each request, besides the system prompt
+    history_window: int = 8
+    a_runtime: AgentRuntime = field(default_factory=AgentRuntime)
+    b_runtime: AgentRuntime = field(default_factory=AgentRuntime)
+
+    @classmethod
+    def from_dict(cls, d):
+        # Accepts the plain dicts used by smoke_test.py and the tools; unknown keys are ignored
+        kw = {k: v for k, v in d.items() if k in cls.__dataclass_fields__ and k not in ('a_runtime', 'b_runtime')}
+        return cls(**kw, a_runtime=AgentRuntime.from_dict(d.get('a_runtime')), b_runtime=AgentRuntime.from_dict(d.get('b_runtime')))
+
+
+class _MessageDeque(collections.deque):
+    """Lock-free worker->GUI channel with the Queue calls the workers and tools use.
+
+    Single consumer (the Tk loop) and GIL-atomic append/popleft make the
+    Queue mutex unnecessary here.
+    """
+
+    put = put_nowait = collections.deque.append
+
+    def get_nowait(self):
+        try:
+            return self.popleft()
+        except IndexError:
+            raise queue.Empty from None
+
+
+class _PersonaPresets(Mapping):
+    """Read-only view over personas.json: name -> (age, quirk, prompt), built on first access."""
+
+    def __init__(self, raw):
+        self._raw = {k: v for k, v in raw.items() if isinstance(v, dict)}
+        self._cache = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._cache[name]
+        except KeyError:
+            v = self._raw[name]
+            out = self._cache[name] = (str(v.get('age', '')), v.get('quirk', ''), v.get('prompt', ''))
+            return out
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+
 class OllamaGUI:
     """Main GUI class for Ollama two-agent chat."""
     def _on_send(self):
@@ -82,7 +424,7 @@ class OllamaGUI:
             except Exception:
                 thread_alive = False
             try:
-                if not thread_alive and hasattr(self, 'start_btn'):
+                if not thread_alive and self.start_btn is not None:
                     try:
                         thread_alive = str(self.start_btn['state']).lower() == 'disabled'
                     except Exception:
@@ -94,7 +436,7 @@ class OllamaGUI:
                 # Inject message into running conversation
                 try:
                     if not hasattr(self, 'to_worker_queue') or getattr(self, 'to_worker_queue', None) is None:
-                        self.to_worker_queue = queue.Queue()
+                        self.to_worker_queue = queue.SimpleQueue()
                     self.to_worker_queue.put(txt)
                     try:
                         # record simple facts from injected message (Stage 1)
@@ -177,23 +519,28 @@ class OllamaGUI:
     def _check_model_status(self, url, model, status_label):
         pass
 
+    def _probe_server(self, url):
+        # Blocking reachability check; returns the status dot colour. Call off the Tk thread.
+        # Results are cached for 5s when up and 1s when down.
+        key = ('srv', url)
+        now = time.monotonic()
+        hit = self._status_cache.get(key)
+        if hit is not None and now - hit[0] < (5 if hit[1] == 'green' else 1):
+            return hit[1]
+        col = 'red'
+        try:
+            req = urllib.request.Request(url.rstrip('/') + '/v1/models')
+            with urllib.request.urlopen(req, timeout=1.5) as resp:
+                if resp.status == 200:
+                    col = 'green'
+        except Exception:
+            pass
+        self._status_cache[key] = (time.monotonic(), col)
+        return col
+
     def _check_server_status(self, url, status_label):
         def worker():
-            try:
-                req = urllib.request.Request(url.rstrip('/') + '/v1/models')
-                with urllib.request.urlopen(req, timeout=1) as resp:
-                    if resp.status == 200:
-                        try:
-                            self.root.after(0, lambda: status_label.config(text='●', foreground='green'))
-                        except Exception:
-                            pass
-                        return
-            except Exception:
-                pass
-            try:
-                self.root.after(0, lambda: status_label.config(text='●', foreground='red'))
-            except Exception:
-                pass
+            self._post_ui(self._apply_status_color, status_label, self._probe_server(url))
         threading.Thread(target=worker, daemon=True).start()
 
     def _open_final_window(self):
@@ -308,7 +655,7 @@ class OllamaGUI:
 
     # --- Simple persistent brain (Stage 1) ---
     def _brain_path(self):
-        return os.path.join(os.path.dirname(__file__), 'brain.json')
+        return os.path.join(_MODULE_DIR, 'brain.json')
 
     def _load_brain(self):
         p = self._brain_path()
@@ -324,20 +671,26 @@ class OllamaGUI:
         p = self._brain_path()
         try:
             d = data if data is not None else getattr(self, '_brain', None) or {'facts': []}
-            with open(p, 'w', encoding='utf-8') as f:
+            # Write a temp file and swap it in, so a crash mid-write can't leave brain.json truncated
+            tmp = p + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
                 json.dump(d, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, p)
             self._brain = d
         except Exception:
             pass
 
     def _add_facts_from_text(self, text):
-        # Simple rule-based fact extraction for Stage 1
-        if not text or not getattr(self, 'memory_enabled', None) or not self.memory_enabled.get():
+        self._add_facts_from_texts((text,))
+
+    def _add_facts_from_texts(self, texts):
+        # Simple rule-based fact extraction for Stage 1; brain.json is written once per batch
+        texts = [t for t in texts if t]
+        if not texts or not getattr(self, 'memory_enabled', None) or not self.memory_enabled.get():
             return
         try:
             brain = getattr(self, '_brain', None) or self._load_brain()
             facts = brain.get('facts', [])
-            txt = text.strip()
             # simple regexes
             patterns = [
                 (r"\bmy name is ([A-Za-z][A-Za-z'\- ]{0,40})", 'name'),
@@ -347,17 +700,19 @@ class OllamaGUI:
                 (r"\bi (?:like|love) ([A-Za-z0-9 ,\-]+)", 'preference'),
             ]
             added = False
-            import re, datetime
+            import datetime
             tnow = datetime.datetime.now().isoformat()
-            for pat, kind in patterns:
-                m = re.search(pat, txt, re.I)
-                if m:
-                    val = m.group(1).strip()
-                    short = f"{kind}: {val}"
-                    # dedupe
-                    if not any(f.get('text','') == short for f in facts):
-                        facts.append({'text': short, 'kind': kind, 'value': val, 'ts': tnow})
-                        added = True
+            for txt in texts:
+                txt = txt.strip()
+                for pat, kind in patterns:
+                    m = re.search(pat, txt, re.I)
+                    if m:
+                        val = m.group(1).strip()
+                        short = f"{kind}: {val}"
+                        # dedupe
+                        if not any(f.get('text','') == short for f in facts):
+                            facts.append({'text': short, 'kind': kind, 'value': val, 'ts': tnow})
+                            added = True
             if added:
                 brain['facts'] = facts
                 self._brain = brain
@@ -418,7 +773,6 @@ class OllamaGUI:
             facts = brain.get('facts', [])
             if not facts:
                 return []
-            import re
             ctx = re.findall(r"[A-Za-z0-9']+", context_text.lower())
             ctx_set = set(w for w in ctx if len(w) > 2)
             scored = []
@@ -496,7 +850,7 @@ class OllamaGUI:
     def __init__(self, root):
         self.root = root
         root.title('Ollama Two-Agent Chat')
-        self.queue = queue.Queue()
+        self.queue = _MessageDeque()
         # --- Notebook and Tabs ---
         self.notebook = ttk.Notebook(root)
         self.notebook.pack(fill='both', expand=True)
@@ -508,6 +862,51 @@ class OllamaGUI:
         self.thread = None
         self.stop_event = threading.Event()
         self.final_text = None
+        self.persona_presets = {}
+        # Widgets built later by _apply_theme; None until then so callers can test cheaply
+        self.a_model = None
+        self.b_model = None
+        self.a_model_list = None
+        self.b_model_list = None
+        self.formatting_var = None
+        self.close_on_exit_var = None
+        self.start_btn = self.stop_btn = self.chat_text = None
+        # Entry-backed fields read by start()/_poll_queue; placeholders keep .get() valid until the real widgets exist
+        self.a_name = tk.StringVar(value='Agent_A')
+        self.b_name = tk.StringVar(value='Agent_B')
+        self.sender_name = tk.StringVar()
+        self.greeting = tk.StringVar()
+        self.a_persona_file_settings = tk.StringVar()
+        self.b_persona_file_settings = tk.StringVar()
+        self._details_job = None
+        self._last_probe = {}
+        self._status_cache = {}
+        self._last_a_vals = ()
+        self._last_b_vals = ()
+        self._last_a_vals_set = frozenset()
+        self._last_b_vals_set = frozenset()
+        self._last_a_models = None
+        self._last_b_models = None
+        # Last model list pushed into each agent's combobox by _fetch_models
+        self._fetched_models = {}
+        self._refresh_pending = False
+        self._last_saved_cfg_hash = None
+        self._persona_file_cache = {}
+        # Chat history turns kept per request; only settable through gui_config.json
+        self.history_window = 8
+        self._connectivity_errstreak = 0
+        self._idle_ticks = 0
+        self._http = None
+        # Short model-fetch jobs; conversations keep their own dedicated thread
+        self._io_pool = _DaemonPool(2, 'ollama-io')
+        # (queue, writer thread) of the running conversation's log, so on_close can flush it
+        self._chat_log = None
+        self._ui_ops = collections.deque()
+        self._ui_scheduled = False
+        # Latest progress per active pull, (server_url, model) -> (msg, pct); written by the
+        # pull workers and shown by _pull_ui_tick
+        self._pulls = {}
+        self._pull_ticking = False
         self._poll_queue()
         self._apply_theme('Dark')
         # Immediately poll connectivity after widgets are created
@@ -520,7 +919,7 @@ class OllamaGUI:
         and wrap at word boundaries to avoid half-line breaks.
         """
         try:
-            import re, textwrap
+            import textwrap
             if not text:
                 return ''
             s = str(text)
@@ -595,6 +994,10 @@ class OllamaGUI:
         style.configure('TEntry', fieldbackground='white', foreground='black')
         style.configure('TCombobox', fieldbackground='white', foreground='black')
         style.configure('TButton', background='SystemButtonFace', foreground='black')
+        # Named styles for the dense runtime/control rows: configured once, shared by every widget
+        style.configure('Run.TSpinbox', padding=0)
+        style.configure('Run.TLabel', padding=0)
+        style.configure('Run.TCheckbutton', padding=0)
 
         # --- Agent Settings ---
 
@@ -724,14 +1127,14 @@ class OllamaGUI:
             memory_frame.pack(fill='x', side='bottom', padx=(0,0), pady=(4,0))
             mem_chk = ttk.Checkbutton(memory_frame, text='Enable Memory', variable=self.memory_enabled)
             mem_chk.pack(side='left', padx=(6,4))
-            Tooltip(mem_chk, 'When enabled, simple facts from your messages are stored in a local brain.')
+            _tooltip(mem_chk, 'When enabled, simple facts from your messages are stored in a local brain.')
         except Exception:
             pass
         try:
             self.ask_confirm_memory = tk.BooleanVar(value=True)
             ask_chk = ttk.Checkbutton(memory_frame, text='Ask to confirm', variable=self.ask_confirm_memory)
             ask_chk.pack(side='left', padx=(4,2))
-            Tooltip(ask_chk, 'When enabled, agents will ask the user to confirm newly recorded facts.')
+            _tooltip(ask_chk, 'When enabled, agents will ask the user to confirm newly recorded facts.')
         except Exception:
             pass
         try:
@@ -751,7 +1154,7 @@ class OllamaGUI:
                 parent = controls_frame
             merge_chk = ttk.Checkbutton(parent, text='Merge final answer', variable=self.merge_final_var)
             merge_chk.pack(side='left', padx=(6,4))
-            Tooltip(merge_chk, 'When enabled, ask both models to produce merge drafts and synthesize a single combined answer.')
+            _tooltip(merge_chk, 'When enabled, ask both models to produce merge drafts and synthesize a single combined answer.')
         except Exception:
             pass
 
@@ -772,11 +1175,11 @@ class OllamaGUI:
         try:
             self.ask_a_btn = ttk.Button(self.btns_frame, text='Ask A', command=lambda: self._ask_single_agent('a'))
             self.ask_a_btn.pack(side='left', padx=2)
-            Tooltip(self.ask_a_btn, 'Ask Agent A a single question and show its answer.')
+            _tooltip(self.ask_a_btn, 'Ask Agent A a single question and show its answer.')
             self.ask_a_indicator = ttk.Label(self.btns_frame, text='', width=2)
             self.ask_b_btn = ttk.Button(self.btns_frame, text='Ask B', command=lambda: self._ask_single_agent('b'))
             self.ask_b_btn.pack(side='left', padx=2)
-            Tooltip(self.ask_b_btn, 'Ask Agent B a single question and show its answer.')
+            _tooltip(self.ask_b_btn, 'Ask Agent B a single question and show its answer.')
             self.ask_b_indicator = ttk.Label(self.btns_frame, text='', width=2)
         except Exception:
             pass
@@ -787,7 +1190,7 @@ class OllamaGUI:
         try:
             self.run_merge_btn = ttk.Button(self.btns_frame, text='Run Live Merge', command=self._on_run_live_merge)
             self.run_merge_btn.pack(side='left', padx=2)
-            Tooltip(self.run_merge_btn, 'Run the three-phase merge using the configured models and show final merged answer.')
+            _tooltip(self.run_merge_btn, 'Run the three-phase merge using the configured models and show final merged answer.')
             # "Open Final Window" button removed: live-merge now auto-opens the final window
         except Exception:
             pass
@@ -812,114 +1215,117 @@ class OllamaGUI:
         runtime_frame = ttk.LabelFrame(self.chat_tab, text='Runtime Options')
         runtime_frame.pack(fill='x', padx=6, pady=(0,6))
         # --- Agent A runtime options with tooltips ---
-        a_temp_label = ttk.Label(runtime_frame, text='A Temp:')
+        a_temp_label = ttk.Label(runtime_frame, style='Run.TLabel', text='A Temp:')
         a_temp_label.grid(row=0, column=0, sticky='w')
         self.a_temp = tk.DoubleVar(value=0.7)
-        a_temp_spin = ttk.Spinbox(runtime_frame, from_=0.0, to=2.0, increment=0.01, textvariable=self.a_temp, width=6)
+        a_temp_spin = ttk.Spinbox(runtime_frame, style='Run.TSpinbox', from_=0.0, to=2.0, increment=0.01, textvariable=self.a_temp, width=6)
         a_temp_spin.grid(row=0, column=1)
-        Tooltip(a_temp_label, 'Temperature: Controls randomness. Higher values = more creative, lower = more focused.')
-        Tooltip(a_temp_spin, 'Temperature: Controls randomness. Higher values = more creative, lower = more focused.')
+        _tooltip(a_temp_label, 'Temperature: Controls randomness. Higher values = more creative, lower = more focused.')
+        _tooltip(a_temp_spin, 'Temperature: Controls randomness. Higher values = more creative, lower = more focused.')
 
-        a_max_tokens_label = ttk.Label(runtime_frame, text='A Max Tokens:')
+        a_max_tokens_label = ttk.Label(runtime_frame, style='Run.TLabel', text='A Max Tokens:')
         a_max_tokens_label.grid(row=0, column=2, sticky='w')
         self.a_max_tokens = tk.IntVar(value=512)
-        a_max_tokens_spin = ttk.Spinbox(runtime_frame, from_=1, to=4096, textvariable=self.a_max_tokens, width=7)
+        a_max_tokens_spin = ttk.Spinbox(runtime_frame, style='Run.TSpinbox', from_=1, to=4096, textvariable=self.a_max_tokens, width=7)
         a_max_tokens_spin.grid(row=0, column=3)
-        Tooltip(a_max_tokens_label, 'Max Tokens: Maximum number of tokens (words/pieces) the model can generate in a response.')
-        Tooltip(a_max_tokens_spin, 'Max Tokens: Maximum number of tokens (words/pieces) the model can generate in a response.')
+        _tooltip(a_max_tokens_label, 'Max Tokens: Maximum number of tokens (words/pieces) the model can generate in a response.')
+        _tooltip(a_max_tokens_spin, 'Max Tokens: Maximum number of tokens (words/pieces) the model can generate in a response.')
 
-        a_top_p_label = ttk.Label(runtime_frame, text='A Top-p:')
+        a_top_p_label = ttk.Label(runtime_frame, style='Run.TLabel', text='A Top-p:')
         a_top_p_label.grid(row=0, column=4, sticky='w')
         self.a_top_p = tk.DoubleVar(value=1.0)
-        a_top_p_spin = ttk.Spinbox(runtime_frame, from_=0.0, to=1.0, increment=0.01, textvariable=self.a_top_p, width=6)
+        a_top_p_spin = ttk.Spinbox(runtime_frame, style='Run.TSpinbox', from_=0.0, to=1.0, increment=0.01, textvariable=self.a_top_p, width=6)
         a_top_p_spin.grid(row=0, column=5)
-        Tooltip(a_top_p_label, 'Top-p: Nucleus sampling. Lower values = more focused, higher = more random.')
-        Tooltip(a_top_p_spin, 'Top-p: Nucleus sampling. Lower values = more focused, higher = more random.')
+        _tooltip(a_top_p_label, 'Top-p: Nucleus sampling. Lower values = more focused, higher = more random.')
+        _tooltip(a_top_p_spin, 'Top-p: Nucleus sampling. Lower values = more focused, higher = more random.')
 
-        a_stop_label = ttk.Label(runtime_frame, text='A Stop:')
+        a_stop_label = ttk.Label(runtime_frame, style='Run.TLabel', text='A Stop:')
         a_stop_label.grid(row=0, column=6, sticky='w')
-        self.a_stop = ttk.Entry(runtime_frame, width=12)
+        self.a_stop_var = tk.StringVar(value='')
+        self.a_stop = ttk.Entry(runtime_frame, width=12, textvariable=self.a_stop_var)
         self.a_stop.grid(row=0, column=7)
-        Tooltip(a_stop_label, 'Stop: Comma-separated list of tokens. Model will stop generating if any are produced.')
-        Tooltip(self.a_stop, 'Stop: Comma-separated list of tokens. Model will stop generating if any are produced.')
+        _tooltip(a_stop_label, 'Stop: Comma-separated list of tokens. Model will stop generating if any are produced.')
+        _tooltip(self.a_stop, 'Stop: Comma-separated list of tokens. Model will stop generating if any are produced.')
 
         self.a_stream = tk.BooleanVar(value=False)
-        a_stream_btn = ttk.Checkbutton(runtime_frame, text='A Stream', variable=self.a_stream)
+        a_stream_btn = ttk.Checkbutton(runtime_frame, style='Run.TCheckbutton', text='A Stream', variable=self.a_stream)
         a_stream_btn.grid(row=0, column=8, padx=4)
-        Tooltip(a_stream_btn, 'Stream: If enabled, model output appears as it is generated (faster feedback).')
+        _tooltip(a_stream_btn, 'Stream: If enabled, model output appears as it is generated (faster feedback).')
 
         # --- Agent B runtime options with tooltips ---
-        b_temp_label = ttk.Label(runtime_frame, text='B Temp:')
+        b_temp_label = ttk.Label(runtime_frame, style='Run.TLabel', text='B Temp:')
         b_temp_label.grid(row=1, column=0, sticky='w')
         self.b_temp = tk.DoubleVar(value=0.7)
-        b_temp_spin = ttk.Spinbox(runtime_frame, from_=0.0, to=2.0, increment=0.01, textvariable=self.b_temp, width=6)
+        b_temp_spin = ttk.Spinbox(runtime_frame, style='Run.TSpinbox', from_=0.0, to=2.0, increment=0.01, textvariable=self.b_temp, width=6)
         b_temp_spin.grid(row=1, column=1)
-        Tooltip(b_temp_label, 'Temperature: Controls randomness. Higher values = more creative, lower = more focused.')
-        Tooltip(b_temp_spin, 'Temperature: Controls randomness. Higher values = more creative, lower = more focused.')
+        _tooltip(b_temp_label, 'Temperature: Controls randomness. Higher values = more creative, lower = more focused.')
+        _tooltip(b_temp_spin, 'Temperature: Controls randomness. Higher values = more creative, lower = more focused.')
 
-        b_max_tokens_label = ttk.Label(runtime_frame, text='B Max Tokens:')
+        b_max_tokens_label = ttk.Label(runtime_frame, style='Run.TLabel', text='B Max Tokens:')
         b_max_tokens_label.grid(row=1, column=2, sticky='w')
         self.b_max_tokens = tk.IntVar(value=512)
-        b_max_tokens_spin = ttk.Spinbox(runtime_frame, from_=1, to=4096, textvariable=self.b_max_tokens, width=7)
+        b_max_tokens_spin = ttk.Spinbox(runtime_frame, style='Run.TSpinbox', from_=1, to=4096, textvariable=self.b_max_tokens, width=7)
         b_max_tokens_spin.grid(row=1, column=3)
-        Tooltip(b_max_tokens_label, 'Max Tokens: Maximum number of tokens (words/pieces) the model can generate in a response.')
-        Tooltip(b_max_tokens_spin, 'Max Tokens: Maximum number of tokens (words/pieces) the model can generate in a response.')
+        _tooltip(b_max_tokens_label, 'Max Tokens: Maximum number of tokens (words/pieces) the model can generate in a response.')
+        _tooltip(b_max_tokens_spin, 'Max Tokens: Maximum number of tokens (words/pieces) the model can generate in a response.')
 
-        b_top_p_label = ttk.Label(runtime_frame, text='B Top-p:')
+        b_top_p_label = ttk.Label(runtime_frame, style='Run.TLabel', text='B Top-p:')
         b_top_p_label.grid(row=1, column=4, sticky='w')
         self.b_top_p = tk.DoubleVar(value=1.0)
-        b_top_p_spin = ttk.Spinbox(runtime_frame, from_=0.0, to=1.0, increment=0.01, textvariable=self.b_top_p, width=6)
+        b_top_p_spin = ttk.Spinbox(runtime_frame, style='Run.TSpinbox', from_=0.0, to=1.0, increment=0.01, textvariable=self.b_top_p, width=6)
         b_top_p_spin.grid(row=1, column=5)
-        Tooltip(b_top_p_label, 'Top-p: Nucleus sampling. Lower values = more focused, higher = more random.')
-        Tooltip(b_top_p_spin, 'Top-p: Nucleus sampling. Lower values = more focused, higher = more random.')
+        _tooltip(b_top_p_label, 'Top-p: Nucleus sampling. Lower values = more focused, higher = more random.')
+        _tooltip(b_top_p_spin, 'Top-p: Nucleus sampling. Lower values = more focused, higher = more random.')
 
-        b_stop_label = ttk.Label(runtime_frame, text='B Stop:')
+        b_stop_label = ttk.Label(runtime_frame, style='Run.TLabel', text='B Stop:')
         b_stop_label.grid(row=1, column=6, sticky='w')
-        self.b_stop = ttk.Entry(runtime_frame, width=12)
+        self.b_stop_var = tk.StringVar(value='')
+        self.b_stop = ttk.Entry(runtime_frame, width=12, textvariable=self.b_stop_var)
         self.b_stop.grid(row=1, column=7)
-        Tooltip(b_stop_label, 'Stop: Comma-separated list of tokens. Model will stop generating if any are produced.')
-        Tooltip(self.b_stop, 'Stop: Comma-separated list of tokens. Model will stop generating if any are produced.')
+        _tooltip(b_stop_label, 'Stop: Comma-separated list of tokens. Model will stop generating if any are produced.')
+        _tooltip(self.b_stop, 'Stop: Comma-separated list of tokens. Model will stop generating if any are produced.')
 
         self.b_stream = tk.BooleanVar(value=False)
-        b_stream_btn = ttk.Checkbutton(runtime_frame, text='B Stream', variable=self.b_stream)
+        b_stream_btn = ttk.Checkbutton(runtime_frame, style='Run.TCheckbutton', text='B Stream', variable=self.b_stream)
         b_stream_btn.grid(row=1, column=8, padx=4)
-        Tooltip(b_stream_btn, 'Stream: If enabled, model output appears as it is generated (faster feedback).')
+        _tooltip(b_stream_btn, 'Stream: If enabled, model output appears as it is generated (faster feedback).')
 
         ctrl_frame = ttk.Frame(self.chat_tab)
         ctrl_frame.pack(fill='x', padx=6, pady=(0,6))
-        ttk.Label(ctrl_frame, text='Topic').grid(row=0, column=0, sticky='w')
-        self.topic = ttk.Entry(ctrl_frame, width=40)
+        ttk.Label(ctrl_frame, style='Run.TLabel', text='Topic').grid(row=0, column=0, sticky='w')
+        self.topic_var = tk.StringVar(value='the benefits of remote work')
+        self.topic = ttk.Entry(ctrl_frame, width=40, textvariable=self.topic_var)
         self.topic.grid(row=0, column=1, sticky='w')
-        self.clear_topic_btn = ttk.Button(ctrl_frame, text='Clear Topic', command=lambda: self.topic.delete(0, 'end'))
+        self.clear_topic_btn = ttk.Button(ctrl_frame, text='Clear Topic', command=lambda: self.topic_var.set(''))
         self.clear_topic_btn.grid(row=0, column=1, sticky='e', padx=(0, 2))
-        ttk.Label(ctrl_frame, text='Turns').grid(row=0, column=2, sticky='w')
+        ttk.Label(ctrl_frame, style='Run.TLabel', text='Turns').grid(row=0, column=2, sticky='w')
         self.turns = tk.IntVar(value=10)
-        ttk.Spinbox(ctrl_frame, from_=1, to=1000, textvariable=self.turns, width=5).grid(row=0, column=3)
-        ttk.Label(ctrl_frame, text='Delay(s)').grid(row=0, column=4, sticky='w')
+        ttk.Spinbox(ctrl_frame, style='Run.TSpinbox', from_=1, to=1000, textvariable=self.turns, width=5).grid(row=0, column=3)
+        ttk.Label(ctrl_frame, style='Run.TLabel', text='Delay(s)').grid(row=0, column=4, sticky='w')
         self.delay = tk.DoubleVar(value=1.0)
-        ttk.Spinbox(ctrl_frame, from_=0.0, to=60.0, increment=0.1, textvariable=self.delay, width=6).grid(row=0, column=5)
+        ttk.Spinbox(ctrl_frame, style='Run.TSpinbox', from_=0.0, to=60.0, increment=0.1, textvariable=self.delay, width=6).grid(row=0, column=5)
         self.humanize_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(ctrl_frame, text='Humanize', variable=self.humanize_var).grid(row=0, column=6, padx=6)
-        ttk.Label(ctrl_frame, text='Greeting').grid(row=1, column=0, sticky='w')
+        ttk.Checkbutton(ctrl_frame, style='Run.TCheckbutton', text='Humanize', variable=self.humanize_var).grid(row=0, column=6, padx=6)
+        ttk.Label(ctrl_frame, style='Run.TLabel', text='Greeting').grid(row=1, column=0, sticky='w')
         self.greeting = ttk.Entry(ctrl_frame, width=40)
         self.greeting.grid(row=1, column=1, sticky='w')
-        ttk.Label(ctrl_frame, text='Max chars A').grid(row=1, column=2, sticky='w')
+        ttk.Label(ctrl_frame, style='Run.TLabel', text='Max chars A').grid(row=1, column=2, sticky='w')
         self.max_chars_a = tk.IntVar(value=120)
-        ttk.Spinbox(ctrl_frame, from_=0, to=10000, textvariable=self.max_chars_a, width=7).grid(row=1, column=3)
+        ttk.Spinbox(ctrl_frame, style='Run.TSpinbox', from_=0, to=10000, textvariable=self.max_chars_a, width=7).grid(row=1, column=3)
         # Place Max chars B on the same line as Max chars A
-        ttk.Label(ctrl_frame, text='Max chars B').grid(row=1, column=4, sticky='w')
+        ttk.Label(ctrl_frame, style='Run.TLabel', text='Max chars B').grid(row=1, column=4, sticky='w')
         self.max_chars_b = tk.IntVar(value=120)
-        ttk.Spinbox(ctrl_frame, from_=0, to=10000, textvariable=self.max_chars_b, width=7).grid(row=1, column=5)
+        ttk.Spinbox(ctrl_frame, style='Run.TSpinbox', from_=0, to=10000, textvariable=self.max_chars_b, width=7).grid(row=1, column=5)
         # Move short-turn and log options to the next row to avoid overlap
         self.short_turn_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(ctrl_frame, text='Short-turn', variable=self.short_turn_var).grid(row=2, column=2, padx=6)
+        ttk.Checkbutton(ctrl_frame, style='Run.TCheckbutton', text='Short-turn', variable=self.short_turn_var).grid(row=2, column=2, padx=6)
         self.log_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(ctrl_frame, text='Log to file', variable=self.log_var).grid(row=2, column=3, padx=6)
-        self.log_path = ttk.Entry(ctrl_frame, width=30)
-        self.log_path.insert(0, '')
+        ttk.Checkbutton(ctrl_frame, style='Run.TCheckbutton', text='Log to file', variable=self.log_var).grid(row=2, column=3, padx=6)
+        self.log_path_var = tk.StringVar(value='')
+        self.log_path = ttk.Entry(ctrl_frame, width=30, textvariable=self.log_path_var)
         self.log_path.grid(row=2, column=4, sticky='w')
         self.close_on_exit_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(ctrl_frame, text='Close terminal on exit', variable=self.close_on_exit_var).grid(row=2, column=5, padx=6)
+        ttk.Checkbutton(ctrl_frame, style='Run.TCheckbutton', text='Close terminal on exit', variable=self.close_on_exit_var).grid(row=2, column=5, padx=6)
         # Place run controls grouped to the right of the same row as max chars
         self.start_btn = ttk.Button(ctrl_frame, text='Start', command=self.start)
         self.start_btn.grid(row=1, column=6, padx=6)
@@ -942,7 +1348,7 @@ class OllamaGUI:
         # Load persona presets and populate preset selectors
         try:
             self.load_personas()
-            preset_names = list(self.persona_presets.keys())
+            preset_names = self._persona_names
             try:
                 if hasattr(self, 'a_preset'):
                     self.a_preset['values'] = preset_names
@@ -988,7 +1394,7 @@ class OllamaGUI:
         persona_frame.pack(fill='x', padx=6, pady=(12,6))
         ttk.Label(persona_frame, text='A Preset:').grid(row=0, column=0, sticky='w', padx=4, pady=4)
         try:
-            a_presets = list(self.persona_presets.keys()) if hasattr(self, 'persona_presets') else []
+            a_presets = getattr(self, '_persona_names', [])
         except Exception:
             a_presets = []
         self.a_preset_settings = ttk.Combobox(persona_frame, width=28, values=a_presets)
@@ -1000,7 +1406,7 @@ class OllamaGUI:
 
         ttk.Label(persona_frame, text='A File:').grid(row=0, column=2, sticky='w', padx=4, pady=4)
         try:
-            ava_files = [f for f in os.listdir(os.path.dirname(__file__)) if f.lower().startswith('persona_ava') and f.lower().endswith('.txt')]
+            ava_files = [f for f in os.listdir(_MODULE_DIR) if f.lower().startswith('persona_ava') and f.lower().endswith('.txt')]
         except Exception:
             ava_files = []
         self.a_persona_file_settings = ttk.Combobox(persona_frame, width=36, values=ava_files)
@@ -1009,9 +1415,7 @@ class OllamaGUI:
             fn = self.a_persona_file_settings.get().strip()
             if not fn: return
             try:
-                p = os.path.join(os.path.dirname(__file__), fn)
-                with open(p, 'r', encoding='utf-8') as pf:
-                    txt = pf.read().strip()
+                txt = self._read_persona_file(fn)
                 try: self.a_persona.delete(0, tk.END); self.a_persona.insert(0, txt)
                 except Exception: pass
                 try: self.queue.put(('status', f'Loaded persona file: {fn}'))
@@ -1026,7 +1430,7 @@ class OllamaGUI:
 
         ttk.Label(persona_frame, text='B Preset:').grid(row=1, column=0, sticky='w', padx=4, pady=4)
         try:
-            b_presets = list(self.persona_presets.keys()) if hasattr(self, 'persona_presets') else []
+            b_presets = getattr(self, '_persona_names', [])
         except Exception:
             b_presets = []
         self.b_preset_settings = ttk.Combobox(persona_frame, width=28, values=b_presets)
@@ -1038,7 +1442,7 @@ class OllamaGUI:
 
         ttk.Label(persona_frame, text='B File:').grid(row=1, column=2, sticky='w', padx=4, pady=4)
         try:
-            orion_files = [f for f in os.listdir(os.path.dirname(__file__)) if f.lower().startswith('persona_orion') and f.lower().endswith('.txt')]
+            orion_files = [f for f in os.listdir(_MODULE_DIR) if f.lower().startswith('persona_orion') and f.lower().endswith('.txt')]
         except Exception:
             orion_files = []
         self.b_persona_file_settings = ttk.Combobox(persona_frame, width=36, values=orion_files)
@@ -1047,9 +1451,7 @@ class OllamaGUI:
             fn = self.b_persona_file_settings.get().strip()
             if not fn: return
             try:
-                p = os.path.join(os.path.dirname(__file__), fn)
-                with open(p, 'r', encoding='utf-8') as pf:
-                    txt = pf.read().strip()
+                txt = self._read_persona_file(fn)
                 try: self.b_persona.delete(0, tk.END); self.b_persona.insert(0, txt)
                 except Exception: pass
                 try: self.queue.put(('status', f'Loaded persona file: {fn}'))
@@ -1072,11 +1474,11 @@ class OllamaGUI:
         ttk.Label(model_mgmt, text='Agent A Models:').grid(row=1, column=0, sticky='w')
         self.a_model_list = tk.Listbox(model_mgmt, width=32, height=6)
         self.a_model_list.grid(row=2, column=0, sticky='w', padx=2)
-        self.a_model_list.bind('<<ListboxSelect>>', lambda e: self._show_model_details('a'))
+        self.a_model_list.bind('<<ListboxSelect>>', lambda e, a='a': self._schedule_details(a))
         self.a_model_entry = ttk.Entry(model_mgmt, width=30)
         self.a_model_entry.grid(row=3, column=0, sticky='w', padx=2, pady=(2,0))
         self.a_model_entry.insert(0, '')
-        self.refresh_a_btn = ttk.Button(model_mgmt, text='Refresh A', command=lambda: (self.save_config(), self._fetch_models(self.a_url.get().strip(), self.a_model, self.refresh_a_btn, self.a_model_status, None, agent='a_settings')))
+        self.refresh_a_btn = ttk.Button(model_mgmt, text='Refresh A', command=lambda a='a': self._refresh_agent(a))
         self.refresh_a_btn.grid(row=4, column=0, sticky='w', padx=2, pady=2)
         self.pull_a_btn = ttk.Button(model_mgmt, text='Pull → Agent A', command=lambda: self._pull_to_urls([self.a_url.get().strip()], self._get_model_to_pull('a')))
         self.pull_a_btn.grid(row=5, column=0, padx=4, pady=2)
@@ -1086,11 +1488,11 @@ class OllamaGUI:
         ttk.Label(model_mgmt, text='Agent B Models:').grid(row=1, column=1, sticky='w')
         self.b_model_list = tk.Listbox(model_mgmt, width=32, height=6)
         self.b_model_list.grid(row=2, column=1, sticky='w', padx=2)
-        self.b_model_list.bind('<<ListboxSelect>>', lambda e: self._show_model_details('b'))
+        self.b_model_list.bind('<<ListboxSelect>>', lambda e, a='b': self._schedule_details(a))
         self.b_model_entry = ttk.Entry(model_mgmt, width=30)
         self.b_model_entry.grid(row=3, column=1, sticky='w', padx=2, pady=(2,0))
         self.b_model_entry.insert(0, '')
-        self.refresh_b_btn = ttk.Button(model_mgmt, text='Refresh B', command=lambda: (self.save_config(), self._fetch_models(self.b_url.get().strip(), self.b_model, self.refresh_b_btn, self.b_model_status, None, agent='b_settings')))
+        self.refresh_b_btn = ttk.Button(model_mgmt, text='Refresh B', command=lambda a='b': self._refresh_agent(a))
         self.refresh_b_btn.grid(row=4, column=1, sticky='w', padx=2, pady=2)
         self.pull_b_btn = ttk.Button(model_mgmt, text='Pull → Agent B', command=lambda: self._pull_to_urls([self.b_url.get().strip()], self._get_model_to_pull('b')))
         self.pull_b_btn.grid(row=5, column=1, padx=4, pady=2)
@@ -1104,14 +1506,23 @@ class OllamaGUI:
         self.model_details_text.grid(row=8, column=0, columnspan=2, sticky='we', pady=(8,2))
         self.model_details_text.config(state='normal')
         self.model_details_text.bind('<1>', lambda e: self.model_details_text.focus_set())
-        self.model_details_text.tag_configure('error', foreground='red')
-        self.model_details_text.tag_configure('warning', foreground='orange')
-        self.model_details_text.tag_configure('info', foreground='#222')
+        self._configure_details_tags()
+        self._model_details_str = ''
         self.copy_all_btn = ttk.Button(model_mgmt, text='Copy All', command=self._copy_model_details)
         self.copy_all_btn.grid(row=9, column=1, sticky='e', pady=(2,6))
 
         # Brain viewer and storage removed per user request
 
+    def _configure_details_tags(self):
+        # Tags live on the widget, so configure them once per Text instance
+        txt = self.model_details_text
+        if getattr(txt, '_tags_configured', False):
+            return
+        txt.tag_configure('error', foreground='red')
+        txt.tag_configure('warning', foreground='orange')
+        txt.tag_configure('info', foreground='#222')
+        setattr(txt, '_tags_configured', True)
+
     def _get_model_to_pull(self, agent):
         # Returns the model name to pull for the given agent: entry field if non-empty, else selected from list
         if agent == 'a':
@@ -1159,6 +1570,15 @@ class OllamaGUI:
                 details = f"Model: {model}"
         self._update_model_details_box(details)
 
+    def _schedule_details(self, agent):
+        # Debounce listbox selection: arrow-keying through a long list only renders the final pick
+        if self._details_job is not None:
+            try:
+                self.root.after_cancel(self._details_job)
+            except tk.TclError:
+                pass
+        self._details_job = self.root.after(80, lambda: self._show_model_details(agent))
+
     def _update_model_details_box(self, details=None):
         self.model_details_text.config(state='normal')
         self.model_details_text.delete('1.0', 'end')
@@ -1186,19 +1606,35 @@ class OllamaGUI:
                     details = f"Model: {model}"
             else:
                 details = ''
+        parts = []
+        # (tag, [lines]) runs; consecutive lines sharing a tag go in as one chunk
+        runs = []
         if details:
-            self.model_details_text.insert('end', details + '\n', 'info')
-            self.model_details_text.insert('end', '-'*60 + '\n', 'info')
+            parts.append(details)
+            parts.append('-'*60)
+            runs.append(('info', [details, '-'*60]))
         # Show status/error log (last 20)
         for ts, msg, level in self._model_status_log[-20:]:
             tag = level if level in ('error','warning','info') else 'info'
-            self.model_details_text.insert('end', f'[{ts}] {msg}\n', tag)
+            line = f'[{ts}] {msg}'
+            parts.append(line)
+            if runs and runs[-1][0] == tag:
+                runs[-1][1].append(line)
+            else:
+                runs.append((tag, [line]))
+        # Keep a plain-text copy so Copy All doesn't have to read the widget back
+        self._model_details_str = '\n'.join(parts)
+        if runs:
+            # Text.insert takes (chars, tags) pairs, so the whole box is a single Tcl call
+            args = []
+            for tag, lines in runs:
+                args.append('\n'.join(lines) + '\n')
+                args.append(tag)
+            self.model_details_text.insert('end', *args)
         self.model_details_text.see('end')
-        self.model_details_text.config(state='normal')
 
     def _add_model_status(self, msg, level='info'):
-        import datetime
-        ts = datetime.datetime.now().strftime('%H:%M:%S')
+        ts = _now_hms()
         self._model_status_log.append((ts, msg, level))
         # Only keep last 50 messages
         if len(self._model_status_log) > 50:
@@ -1208,8 +1644,7 @@ class OllamaGUI:
     def _copy_model_details(self):
         self.model_details_text.focus_set()
         self.root.clipboard_clear()
-        text = self.model_details_text.get('1.0', 'end').strip()
-        self.root.clipboard_append(text)
+        self.root.clipboard_append(self._model_details_str)
 
     def _set_model_busy(self, msg):
         self.model_busy_var.set(msg)
@@ -1227,94 +1662,87 @@ class OllamaGUI:
         self.root.quit()
 
     def _get_selected_model(self, listbox):
+        # Single-select listboxes: curselection() is () or a 1-tuple, never raises IndexError
         try:
-            selection = listbox.curselection()
-            if selection:
-                return listbox.get(selection[0])
-        except Exception:
-            pass
-        return ''
+            sel = listbox.curselection()
+            return listbox.get(sel[0]) if sel else ''
+        except tk.TclError:
+            return ''
 
     # Brain subsystem removed: load/wipe helpers deleted
 
 
+    def _refresh_agent(self, agent):
+        # Settings-tab Refresh button: persist edits first, then refetch that agent's models
+        self.save_config()
+        if agent == 'a':
+            url, model_var, btn, status = self.a_url, self.a_model, self.refresh_a_btn, self.a_model_status
+        else:
+            url, model_var, btn, status = self.b_url, self.b_model, self.refresh_b_btn, self.b_model_status
+        self._fetch_models(url.get().strip(), model_var, btn, status, None, agent=f'{agent}_settings')
+
     def _refresh_a_models(self):
         self._set_model_busy('Refreshing Agent A models...')
-        self.root.after(100, lambda: self._fetch_models(self.a_url.get().strip(), self.a_model, self.refresh_a_btn, self.a_model_status, None, agent='a_settings'))
+        url = self.a_url.get().strip()
+        self.root.after(100, lambda: self._fetch_models(url, self.a_model, self.refresh_a_btn, self.a_model_status, None, agent='a_settings'))
 
     def _refresh_b_models(self):
         self._set_model_busy('Refreshing Agent B models...')
-        self.root.after(100, lambda: self._fetch_models(self.b_url.get().strip(), self.b_model, self.refresh_b_btn, self.b_model_status, None, agent='b_settings'))
+        url = self.b_url.get().strip()
+        self.root.after(100, lambda: self._fetch_models(url, self.b_model, self.refresh_b_btn, self.b_model_status, None, agent='b_settings'))
+
+    def _schedule_chat_tab_refresh(self):
+        # Coalesce bursts of model-list updates into one combobox refresh
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        def run():
+            self._refresh_pending = False
+            self._refresh_chat_tab_model_selectors()
+        try:
+            self.root.after_idle(run)
+        except Exception:
+            self._refresh_pending = False
 
     def _refresh_chat_tab_model_selectors(self):
         """Synchronize the Chat-tab comboboxes with the Settings tab model lists."""
-        try:
-            a_vals = []
-            b_vals = []
-            try:
-                if hasattr(self, 'a_model_list'):
-                    a_vals = list(self.a_model_list.get(0, tk.END))
-            except Exception:
-                a_vals = []
-            try:
-                if hasattr(self, 'b_model_list'):
-                    b_vals = list(self.b_model_list.get(0, tk.END))
-            except Exception:
-                b_vals = []
-            # Update the main runtime comboboxes in the Chat tab
+        for lb, cb, last in ((self.a_model_list, self.a_model, '_last_a_vals'), (self.b_model_list, self.b_model, '_last_b_vals')):
+            if lb is None or cb is None:
+                continue
             try:
-                if hasattr(self, 'a_model'):
-                    try:
-                        self.a_model['values'] = a_vals
-                        cur = self.a_model.get()
-                        if cur not in a_vals and a_vals:
-                            self.a_model.set(a_vals[0])
-                    except Exception:
-                        pass
+                # Listbox.get already returns a tuple; pass it through as-is
+                vals = lb.get(0, tk.END)
+                # Only hand Tk a new list when it actually changed
+                if vals != getattr(self, last):
+                    setattr(self, last, vals)
+                    setattr(self, last + '_set', frozenset(vals))
+                    cb.configure(values=vals)
+                cur = cb.get()
+                if vals and cur not in getattr(self, last + '_set'):
+                    cb.set(vals[0])
             except Exception:
                 pass
-            try:
-                if hasattr(self, 'b_model'):
-                    try:
-                        self.b_model['values'] = b_vals
-                        cur = self.b_model.get()
-                        if cur not in b_vals and b_vals:
-                            self.b_model.set(b_vals[0])
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-        except Exception:
-            pass
 
     # Removed _on_chat_selector_change: bottom selectors were duplicate; main comboboxes are authoritative
 
     def _update_models_text(self, agent, models):
-        if agent == 'a_settings':
-            self.a_model_list.delete(0, tk.END)
-            if models:
-                for m in models:
-                    self.a_model_list.insert(tk.END, m)
-            else:
-                self.a_model_list.insert(tk.END, '(No models found or fetch failed)')
+        if agent in ('a_settings', 'b_settings'):
+            a = agent[0]
+            lb = self.a_model_list if a == 'a' else self.b_model_list
+            tv = tuple(models or ())
+            # Same list as last time: leave the listbox (and its selection) alone
+            if tv == getattr(self, f'_last_{a}_models'):
+                return
+            setattr(self, f'_last_{a}_models', tv)
+            lb.delete(0, tk.END)
+            # One Tcl call for the whole list
+            lb.insert(tk.END, *(tv or ('(No models found or fetch failed)',)))
             # Auto-select and show details for first model after refresh
-            self._auto_select_first_model('a')
-        elif agent == 'b_settings':
-            self.b_model_list.delete(0, tk.END)
-            if models:
-                for m in models:
-                    self.b_model_list.insert(tk.END, m)
-            else:
-                self.b_model_list.insert(tk.END, '(No models found or fetch failed)')
-            self._auto_select_first_model('b')
+            self._auto_select_first_model(a)
         # No-op for 'a' and 'b' agents as a_models_text and b_models_text widgets are not defined
         # Also refresh the Chat-tab model selectors if present
         try:
-            if hasattr(self, '_refresh_chat_tab_model_selectors'):
-                try:
-                    self._refresh_chat_tab_model_selectors()
-                except Exception:
-                    pass
+            self._schedule_chat_tab_refresh()
         except Exception:
             pass
     # Patch _fetch_models to also fetch model details if available
@@ -1332,45 +1760,104 @@ class OllamaGUI:
 
 
     def _poll_connectivity(self):
-        # Poll server and model status every 2 seconds
+        # Poll server status (2-5s, see _CONNECTIVITY_POLL_*); probes run on the pool and report back via self.queue
+        now = time.monotonic()
+        by_url = {}
         try:
-            self._check_server_status(self.a_url.get().strip(), self.a_model_status)
-            self._check_server_status(self.b_url.get().strip(), self.b_model_status)
-            self._check_model_status(self.a_url.get().strip(), self.a_model.get().strip(), self.a_model_status)
-            self._check_model_status(self.b_url.get().strip(), self.b_model.get().strip(), self.b_model_status)
-            # Status indicators already updated above with a_model_status and b_model_status
+            a_url = self.a_url.get().strip(); b_url = self.b_url.get().strip()
+            a_model = self.a_model.get().strip(); b_model = self.b_model.get().strip()
         except Exception:
-            pass
-        # Schedule next poll
-        self.root.after(2000, self._poll_connectivity)
-
-    def _call_ollama_with_timeout(self, client_url, model, messages, runtime_options=None, timeout=20):
-        """Call chat_with_ollama in a thread and return its result or a timeout error."""
-        result = {}
-        def worker():
-            try:
-                res = chat_with_ollama(client_url, model, messages, runtime_options=runtime_options)
-            except Exception as e:
-                res = {"content": f"[ERROR calling {client_url}: {e}]"}
+            self.root.after(_CONNECTIVITY_POLL_ERR_MS, self._poll_connectivity)
+            return
+        for agent, key in (('a', (a_url, a_model)), ('b', (b_url, b_model))):
+            # Skip a recently probed, unchanged target only while it was up; after a failure
+            # the faster error-rate poll must actually re-probe so recovery shows promptly
+            last = self._last_probe.get(agent)
+            if (last is not None and last[0] == key and now - last[1] < 10
+                    and self._status_cache.get(('srv', key[0]), (0, None))[1] == 'green'):
+                continue
+            self._last_probe[agent] = (key, now)
+            by_url.setdefault(key[0], []).append(agent)
+        # One probe per distinct server, fanned out to every agent pointing at it
+        for url, agents in by_url.items():
+            def probe(u=url, ags=tuple(agents)):
+                col = self._probe_server(u)
+                for a in ags:
+                    self.queue.put((f'{a}_status', col))
             try:
-                result['res'] = res
+                _OLLAMA_POOL.submit(probe)
             except Exception:
-                result['res'] = {"content": "[ERROR]"}
+                pass
+        # Schedule next poll; results arrive asynchronously, so use the streak seen so far
+        self.root.after(_CONNECTIVITY_POLL_ERR_MS if self._connectivity_errstreak else _CONNECTIVITY_POLL_OK_MS, self._poll_connectivity)
+
+    def _log_writer(self, fh, q):
+        # Owns fh: each wake writes everything queued since the last one; the file is
+        # flushed once the queue has been quiet for a second, and on close
+        dirty = False
+        try:
+            while True:
+                try:
+                    batch = [q.get(timeout=1.0)]
+                except queue.Empty:
+                    if dirty:
+                        try: fh.flush()
+                        except Exception: pass
+                        dirty = False
+                    continue
+                while True:
+                    try: batch.append(q.get_nowait())
+                    except queue.Empty: break
+                # None closes the log; it is normally the last item, but on_close can put one
+                # while the conversation is still running, so drop anything queued after it
+                done = None in batch
+                if done:
+                    del batch[batch.index(None):]
+                try:
+                    fh.writelines(batch)
+                    dirty = True
+                except Exception:
+                    pass
+                if done:
+                    return
+        finally:
+            try: fh.close()
+            except Exception: pass
+
+    def _call_ollama_with_timeout(self, client_url, model, messages, runtime_options=None, timeout=20, until=None):
+        """Call chat_with_ollama on the chat pool and return its result or a timeout error.
 
-        t = threading.Thread(target=worker, daemon=True)
-        t.start()
-        t.join(timeout)
-        if t.is_alive():
-            # Thread still running — return a timeout placeholder and leave the worker to finish in background
+        With ``until``, the reply is streamed and reading stops as soon as ``until(text)`` is true.
+        """
+        started = threading.Event()
+
+        def call():
+            started.set()
+            if until is None:
+                return chat_with_ollama(client_url, model, messages, timeout=timeout, runtime_options=runtime_options)
+            return stream_chat_with_ollama(client_url, model, messages, timeout=timeout,
+                                           runtime_options=runtime_options, until=until)
+
+        fut = _CHAT_POOL.submit(call)
+        try:
+            # The timeout covers the call itself, not time spent queued behind other chat calls
+            # (those are bounded by their own timeouts, so the queue always drains)
+            while not started.wait(1.0) and not fut.done():
+                pass
+            res = fut.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            # Running -> the HTTP timeout closes the socket
             return {"content": f"[ERROR: timeout after {timeout}s contacting {client_url}]"}
-        return result.get('res', {"content": "[ERROR: no response]"})
+        except Exception as e:
+            return {"content": f"[ERROR calling {client_url}: {e}]"}
+        return res if res is not None else {"content": "[ERROR: no response]"}
 
     def _ask_single_agent(self, agent):
         """Send a one-shot question to Agent 'a' or 'b' and display the answer."""
         try:
             q = ''
             try:
-                q = (self._get_user_input_text() if hasattr(self, '_get_user_input_text') else (self.user_input.get().strip() if hasattr(self, 'user_input') else '')) or (self.topic.get().strip() if hasattr(self, 'topic') else '')
+                q = (self._get_user_input_text() if hasattr(self, '_get_user_input_text') else (self.user_input.get().strip() if hasattr(self, 'user_input') else '')) or (self.topic_var.get().strip() if hasattr(self, 'topic_var') else '')
             except Exception:
                 q = ''
             if not q:
@@ -1382,27 +1869,27 @@ class OllamaGUI:
 
             if agent == 'a':
                 url = self.a_url.get().strip() if hasattr(self, 'a_url') else ''
-                model = self.a_model.get().strip() if hasattr(self, 'a_model') else ''
+                model = self.a_model.get().strip() if self.a_model is not None else ''
                 runtime = {
                     'temperature': float(self.a_temp.get()) if hasattr(self, 'a_temp') else 0.7,
                     'max_tokens': int(self.a_max_tokens.get()) if hasattr(self, 'a_max_tokens') else 512,
                     'top_p': float(self.a_top_p.get()) if hasattr(self, 'a_top_p') else 1.0,
-                    'stop': [s.strip() for s in (self.a_stop.get().split(',') if hasattr(self, 'a_stop') else []) if s.strip()],
+                    'stop': [s.strip() for s in (self.a_stop_var.get().split(',') if hasattr(self, 'a_stop_var') else []) if s.strip()],
                     'stream': bool(self.a_stream.get()) if hasattr(self, 'a_stream') else False,
                 }
-                name = self.a_name.get().strip() if hasattr(self, 'a_name') else 'Agent_A'
+                name = self.a_name.get().strip()
                 ask_btn = getattr(self, 'ask_a_btn', None)
             else:
                 url = self.b_url.get().strip() if hasattr(self, 'b_url') else ''
-                model = self.b_model.get().strip() if hasattr(self, 'b_model') else ''
+                model = self.b_model.get().strip() if self.b_model is not None else ''
                 runtime = {
                     'temperature': float(self.b_temp.get()) if hasattr(self, 'b_temp') else 0.7,
                     'max_tokens': int(self.b_max_tokens.get()) if hasattr(self, 'b_max_tokens') else 512,
                     'top_p': float(self.b_top_p.get()) if hasattr(self, 'b_top_p') else 1.0,
-                    'stop': [s.strip() for s in (self.b_stop.get().split(',') if hasattr(self, 'b_stop') else []) if s.strip()],
+                    'stop': [s.strip() for s in (self.b_stop_var.get().split(',') if hasattr(self, 'b_stop_var') else []) if s.strip()],
                     'stream': bool(self.b_stream.get()) if hasattr(self, 'b_stream') else False,
                 }
-                name = self.b_name.get().strip() if hasattr(self, 'b_name') else 'Agent_B'
+                name = self.b_name.get().strip()
                 ask_btn = getattr(self, 'ask_b_btn', None)
 
             sys_msg = f'You are {name}. Answer the user concisely and helpfully.'
@@ -1590,9 +2077,9 @@ class OllamaGUI:
     def _run_live_merge(self):
         try:
             self.status_var.set('Running live merge...')
-            question = (self.topic.get().strip() if hasattr(self, 'topic') else '') or (self.user_input.get().strip() if hasattr(self, 'user_input') else '') or 'Please answer the user question.'
+            question = (self.topic_var.get().strip() if hasattr(self, 'topic_var') else '') or (self.user_input.get().strip() if hasattr(self, 'user_input') else '') or 'Please answer the user question.'
             try:
-                user_name = (self.sender_name.get().strip() if hasattr(self, 'sender_name') else '') or None
+                user_name = self.sender_name.get().strip() or None
             except Exception:
                 user_name = None
             try:
@@ -1601,8 +2088,8 @@ class OllamaGUI:
                 mem_summary = ''
             a_url = self.a_url.get().strip() if hasattr(self, 'a_url') else ''
             b_url = self.b_url.get().strip() if hasattr(self, 'b_url') else ''
-            a_model = self.a_model.get().strip() if hasattr(self, 'a_model') else ''
-            b_model = self.b_model.get().strip() if hasattr(self, 'b_model') else ''
+            a_model = self.a_model.get().strip() if self.a_model is not None else ''
+            b_model = self.b_model.get().strip() if self.b_model is not None else ''
             timeout = 30
 
             # Phase 1: independent answers
@@ -1610,16 +2097,11 @@ class OllamaGUI:
             if cancel_event is not None and cancel_event.is_set():
                 try:
                     self.status_var.set('Live merge canceled')
-                    if getattr(self, 'merge_progress_label', None) is not None:
-                        self.root.after(0, lambda: self.merge_progress_label.config(text='Canceled before phase 1') if self.merge_progress_label is not None else None)
                 except Exception:
                     pass
+                self._set_merge_progress('Canceled before phase 1')
                 return
-            try:
-                if getattr(self, 'merge_progress_label', None) is not None:
-                    self.root.after(0, lambda: self.merge_progress_label.config(text='Phase 1: requesting initial answers...') if self.merge_progress_label is not None else None)
-            except Exception:
-                pass
+            self._set_merge_progress('Phase 1: requesting initial answers...')
             parts = []
             if user_name:
                 parts.append(f"Human: {user_name}")
@@ -1644,16 +2126,11 @@ class OllamaGUI:
             if cancel_event is not None and cancel_event.is_set():
                 try:
                     self.status_var.set('Live merge canceled')
-                    if getattr(self, 'merge_progress_label', None) is not None:
-                        self.root.after(0, lambda: self.merge_progress_label.config(text='Canceled before critiques') if self.merge_progress_label is not None else None)
                 except Exception:
                     pass
+                self._set_merge_progress('Canceled before critiques')
                 return
-            try:
-                if getattr(self, 'merge_progress_label', None) is not None:
-                    self.root.after(0, lambda: self.merge_progress_label.config(text='Phase 2: requesting critiques...') if self.merge_progress_label is not None else None)
-            except Exception:
-                pass
+            self._set_merge_progress('Phase 2: requesting critiques...')
             crit_a_text = (
                 "Phase: critique.\n"
                 "Instruction: Identify strengths, weaknesses, missing details, and incorrect reasoning in the other model's answer. Be objective and brief.\n"
@@ -1672,16 +2149,11 @@ class OllamaGUI:
             if cancel_event is not None and cancel_event.is_set():
                 try:
                     self.status_var.set('Live merge canceled')
-                    if getattr(self, 'merge_progress_label', None) is not None:
-                        self.root.after(0, lambda: self.merge_progress_label.config(text='Canceled before merge drafts') if self.merge_progress_label is not None else None)
                 except Exception:
                     pass
+                self._set_merge_progress('Canceled before merge drafts')
                 return
-            try:
-                if getattr(self, 'merge_progress_label', None) is not None:
-                    self.root.after(0, lambda: self.merge_progress_label.config(text='Phase 3: requesting merge drafts...') if self.merge_progress_label is not None else None)
-            except Exception:
-                pass
+            self._set_merge_progress('Phase 3: requesting merge drafts...')
             merge_text = (
                 "Phase: final_merge.\n"
                 f"Question: {question}\n"
@@ -1699,16 +2171,11 @@ class OllamaGUI:
             if cancel_event is not None and cancel_event.is_set():
                 try:
                     self.status_var.set('Live merge canceled')
-                    if getattr(self, 'merge_progress_label', None):
-                        self.root.after(0, lambda: self.merge_progress_label.config(text='Canceled before final synthesis') if self.merge_progress_label is not None else None)
                 except Exception:
                     pass
+                self._set_merge_progress('Canceled before final synthesis')
                 return
-            try:
-                if getattr(self, 'merge_progress_label', None) is not None:
-                    self.root.after(0, lambda: self.merge_progress_label.config(text='Final synthesis in progress...') if self.merge_progress_label is not None else None)
-            except Exception:
-                pass
+            self._set_merge_progress('Final synthesis in progress...')
             synth_text = (
                 "Phase: synthesize.\n"
                 "Instruction: Synthesize the two drafts into one concise final answer and briefly mention any conflicts you resolved.\n"
@@ -1725,11 +2192,7 @@ class OllamaGUI:
             except Exception:
                 pass
             self.status_var.set('Live merge finished')
-            try:
-                if getattr(self, 'merge_progress_label', None) is not None:
-                    self.root.after(0, lambda: (self.merge_progress_label and self.merge_progress_label.config(text='Completed — final merged answer ready')))
-            except Exception:
-                pass
+            self._set_merge_progress('Completed — final merged answer ready')
         except Exception as e:
             try:
                 self.queue.put(('merged_final', f'[ERROR running live merge: {e}]'))
@@ -1756,21 +2219,48 @@ class OllamaGUI:
             except Exception:
                 pass
 
+    @property
+    def persona_presets(self):
+        return self._persona_presets
+
+    @persona_presets.setter
+    def persona_presets(self, value):
+        self._persona_presets = value
+        # Rebuilt on the next save_config, not on every one
+        self._persona_presets_serialized = None
+
+    def _serialized_persona_presets(self):
+        if self._persona_presets_serialized is None:
+            self._persona_presets_serialized = {k: {'age': v[0], 'quirk': v[1], 'prompt': v[2]} for k, v in self.persona_presets.items()}
+        return self._persona_presets_serialized
+
+    def _read_persona_file(self, fn):
+        # Persona .txt next to this module; re-read only when its mtime changes.
+        # One entry per path (path -> (mtime, text)), so edits replace rather than accumulate
+        p = os.path.join(_MODULE_DIR, fn)
+        mtime = os.stat(p).st_mtime_ns
+        hit = self._persona_file_cache.get(p)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        with open(p, 'r', encoding='utf-8') as pf:
+            txt = pf.read().strip()
+        self._persona_file_cache[p] = (mtime, txt)
+        return txt
+
     def load_personas(self, path=DEFAULT_PERSONAS_PATH):
         if not os.path.exists(path):
             # nothing to load
             self.persona_presets = {}
+            self._persona_names = []
             return
         try:
-            with open(path, 'r', encoding='utf-8') as f:
+            # JSON is UTF-8 by definition; let the decoder read bytes directly
+            with open(path, 'rb') as f:
                 data = json.load(f)
-            out = {}
-            for name, v in data.items():
-                if isinstance(v, dict):
-                    out[name] = (str(v.get('age', '')), v.get('quirk', ''), v.get('prompt', ''))
-            self.persona_presets = out
+            self.persona_presets = _PersonaPresets(data)
         except Exception:
             self.persona_presets = {}
+        self._persona_names = list(self.persona_presets)
 
     def save_config(self, path=DEFAULT_CONFIG):
         cfg = {
@@ -1786,37 +2276,49 @@ class OllamaGUI:
             'b_age': self.b_age.get().strip(),
             'a_quirk': self.a_quirk.get().strip(),
             'b_quirk': self.b_quirk.get().strip(),
-            'topic': self.topic.get().strip(),
+            'topic': self.topic_var.get().strip(),
             'turns': int(self.turns.get()),
             'delay': float(self.delay.get()),
             'max_chars_a': int(self.max_chars_a.get()),
             'max_chars_b': int(self.max_chars_b.get()),
             'short_turn': bool(self.short_turn_var.get()),
             'log': bool(self.log_var.get()),
-            'log_path': self.log_path.get().strip(),
+            'log_path': self.log_path_var.get().strip(),
             'close_on_exit': bool(self.close_on_exit_var.get()),
+            'history_window': self.history_window,
             # Pull model management config removed
-            'persona_presets': {k: {'age': v[0], 'quirk': v[1], 'prompt': v[2]} for k, v in self.persona_presets.items()},
+            'persona_presets': self._serialized_persona_presets(),
             'a_preset': self.a_preset.get().strip() if hasattr(self, 'a_preset') else '',
             'b_preset': self.b_preset.get().strip() if hasattr(self, 'b_preset') else '',
             'a_runtime': {
                 'temperature': float(self.a_temp.get()),
                 'max_tokens': int(self.a_max_tokens.get()),
                 'top_p': float(self.a_top_p.get()),
-                'stop': [s.strip() for s in self.a_stop.get().split(',') if s.strip()],
+                'stop': list(filter(None, map(str.strip, self.a_stop_var.get().split(',')))),
                 'stream': bool(self.a_stream.get()),
             },
             'b_runtime': {
                 'temperature': float(self.b_temp.get()),
                 'max_tokens': int(self.b_max_tokens.get()),
                 'top_p': float(self.b_top_p.get()),
-                'stop': [s.strip() for s in self.b_stop.get().split(',') if s.strip()],
+                'stop': list(filter(None, map(str.strip, self.b_stop_var.get().split(',')))),
                 'stream': bool(self.b_stream.get()),
             },
         }
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(cfg, f, indent=2)
+            payload = json.dumps(cfg, indent=2, ensure_ascii=False)
+            # Most saves (param tweaks, exit) write identical content; skip those
+            digest = (path, hash(payload))
+            if digest == self._last_saved_cfg_hash and os.path.exists(path):
+                return
+            # Write to a sibling temp file and swap it in so a crash never leaves a torn config
+            tmp = path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            self._last_saved_cfg_hash = digest
         except Exception:
             pass
 
@@ -1826,147 +2328,136 @@ class OllamaGUI:
         if not os.path.exists(path):
             return
         try:
-            with open(path, 'r', encoding='utf-8') as f:
+            with open(path, 'rb') as f:
                 cfg = json.load(f)
         except Exception:
             return
-
-        def s_set(widget, val):
-            try:
-                if val is None:
-                    return
-                if hasattr(widget, 'delete') and hasattr(widget, 'insert'):
-                    widget.delete(0, tk.END); widget.insert(0, str(val))
-                else:
-                    try:
-                        widget.set(str(val))
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-
         # restore simple entries and comboboxes if present
+        for attr, key, coerce in _CONFIG_FIELDS:
+            self._apply_cfg(cfg, attr, key, coerce)
+        try: self.history_window = max(1, int(cfg.get('history_window', 8)))
+        except (TypeError, ValueError): pass
+
+    def _apply_cfg(self, cfg, attr, key, coerce=str):
+        # Write cfg[key] into the widget self.<attr>; missing widgets/keys are left alone
         try:
-            if hasattr(self, 'a_age'): s_set(self.a_age, cfg.get('a_age', self.a_age.get()))
-            if hasattr(self, 'b_age'): s_set(self.b_age, cfg.get('b_age', self.b_age.get()))
-            if hasattr(self, 'a_quirk'): s_set(self.a_quirk, cfg.get('a_quirk', self.a_quirk.get()))
-            if hasattr(self, 'b_quirk'): s_set(self.b_quirk, cfg.get('b_quirk', self.b_quirk.get()))
-            # restore preset selectors (both chat-tab and settings-tab controls if present)
-            if hasattr(self, 'a_preset'): s_set(self.a_preset, cfg.get('a_preset', getattr(self, 'a_preset').get()))
-            if hasattr(self, 'b_preset'): s_set(self.b_preset, cfg.get('b_preset', getattr(self, 'b_preset').get()))
-            if hasattr(self, 'a_preset_settings'): s_set(self.a_preset_settings, cfg.get('a_preset', getattr(self, 'a_preset_settings').get()))
-            if hasattr(self, 'b_preset_settings'): s_set(self.b_preset_settings, cfg.get('b_preset', getattr(self, 'b_preset_settings').get()))
+            val = cfg.get(key)
+            widget = getattr(self, attr, None)
+            if val is None or widget is None:
+                return
+            if hasattr(widget, 'delete') and hasattr(widget, 'insert'):
+                widget.delete(0, tk.END); widget.insert(0, coerce(val))
+            else:
+                widget.set(coerce(val))
         except Exception:
             pass
-    def _poll_queue(self):
-        def format_markdown(md):
-            import re
-            # Bold: **text** or __text__
-            md = re.sub(r'\*\*(.*?)\*\*|__(.*?)__', lambda m: m.group(1) or m.group(2), md)
-            # Italic: *text* or _text_
-            md = re.sub(r'\*(.*?)\*|_(.*?)_', lambda m: m.group(1) or m.group(2), md)
-            # Inline code: `code`
-            md = re.sub(r'`([^`]*)`', r'[code]\1[/code]', md)
-            # Code blocks: ```code```
-            md = re.sub(r'```([\s\S]*?)```', r'\n[code]\1[/code]\n', md)
-            # Lists: - item or * item
-            md = re.sub(r'^[\s]*[-\*] (.*)', r'• \1', md, flags=re.MULTILINE)
-            # Headers: # Header
-            md = re.sub(r'^#+ (.*)', r'\1', md, flags=re.MULTILINE)
-            # Blockquotes: > quote
-            md = re.sub(r'^> (.*)', r'"\1"', md, flags=re.MULTILINE)
-            return md
 
+    def _drain(self, limit=None):
+        # Pop up to `limit` queued messages, oldest first
+        pop = self.queue.popleft
+        items = []
         try:
-            while True:
-                kind, text = self.queue.get_nowait()
-                fmt = self.formatting_var.get() if hasattr(self, 'formatting_var') else 'plain'
-                if fmt == 'plain':
-                    formatted = text
-                elif fmt == 'markdown':
-                    formatted = format_markdown(text)
-                elif fmt == 'raw':
-                    formatted = text
+            while limit is None or len(items) < limit:
+                items.append(pop())
+        except IndexError:
+            pass
+        return items
+
+    # Queue message handlers, dispatched through _QUEUE_HANDLERS; each folds one message into `tick`
+    def _q_chat(self, tick, kind, text):
+        try:
+            if kind == 'a':
+                name = self.a_name.get().strip()
+            elif kind == 'b':
+                name = self.b_name.get().strip()
+            else:
+                name = self.sender_name.get().strip() or 'You'
+            tick['chat'].append(f"{name}: {self._reflow(text, width=100)}\n\n")
+        except Exception:
+            pass
+
+    def _q_status(self, tick, kind, text):
+        tick['status'] = text
+        m = _TURN_RE.search(text)
+        if m:
+            tick['turn_count'] = f"{m.group(1)}/{m.group(2)}"
+
+    def _q_done(self, tick, kind, text):
+        tick['done'] = True
+        tick['status'] = 'Finished.'
+        tick['turn_count'] = ''
+
+    def _q_final(self, tick, kind, text):
+        tick['final'] = text
+
+    def _q_dot(self, tick, kind, text):
+        tick['dots'][kind[0]] = text
+
+    def _poll_queue(self):
+        # Drain a bounded batch, fold it into one update, then touch the widgets once
+        tick = {'chat': [], 'status': None, 'turn_count': None, 'done': False, 'final': None, 'dots': {}}
+        items = self._drain(_QUEUE_MAX_BATCH)
+        if items:
+            md = self.formatting_var is not None and self.formatting_var.get() == 'markdown'
+            for kind, text in items:
+                # Kinds without a handler (initial_*/critique_*/draft_* merge phases) are ignored
+                handler = _QUEUE_HANDLERS.get(kind)
+                if handler is not None:
+                    handler(self, tick, kind, _format_markdown(text) if md else text)
+        if tick['chat']:
+            self.chat_text.config(state='normal')
+            self.chat_text.insert('end', ''.join(tick['chat']))
+            self.chat_text.see('end')
+            self.chat_text.config(state='disabled')
+        if tick['done']:
+            self._safe_config(self.start_btn, state='normal'); self._safe_config(self.stop_btn, state='disabled')
+        if tick['status'] is not None:
+            self.status_var.set(tick['status'])
+        if tick['turn_count'] is not None:
+            try:
+                self.turn_count_var.set(tick['turn_count'])
+            except Exception:
+                pass
+        if tick['final'] is not None:
+            self._show_merged_final(tick['final'])
+        dots = tick['dots']
+        for agent, col in dots.items():
+            self._safe_config(getattr(self, f'{agent}_model_status', None), text='●', foreground=col)
+        if dots:
+            self._connectivity_errstreak = self._connectivity_errstreak + 1 if 'red' in dots.values() else 0
+        # Stay on the fast cadence until several consecutive ticks come up empty
+        self._idle_ticks = 0 if items else self._idle_ticks + 1
+        self.root.after(_QUEUE_POLL_ACTIVE_MS if self._idle_ticks < _QUEUE_IDLE_TICKS else _QUEUE_POLL_IDLE_MS, self._poll_queue)
+
+    def _show_merged_final(self, formatted):
+        try:
+            disp = self._reflow(formatted, width=100)
+            # If final popup exists, update it; otherwise open the popup and populate it
+            try:
+                if hasattr(self, 'final_win_text') and getattr(self, 'final_win_text', None) is not None:
+                    self.final_win_text.config(state='normal')
+                    self.final_win_text.delete('1.0', 'end')
+                    self.final_win_text.insert('end', disp)
+                    self.final_win_text.see('end')
+                    self.final_win_text.config(state='disabled')
                 else:
-                    formatted = text
-                if kind == 'a':
-                    name = self.a_name.get().strip() if hasattr(self, 'a_name') else 'Agent_A'
-                    self.chat_text.config(state='normal')
-                    disp = self._reflow(formatted, width=100)
-                    self.chat_text.insert('end', f"{name}: " + disp + '\n\n')
-                    self.chat_text.see('end')
-                    self.chat_text.config(state='disabled')
-                elif kind == 'b':
-                    name = self.b_name.get().strip() if hasattr(self, 'b_name') else 'Agent_B'
-                    self.chat_text.config(state='normal')
-                    disp = self._reflow(formatted, width=100)
-                    self.chat_text.insert('end', f"{name}: " + disp + '\n\n')
-                    self.chat_text.see('end')
-                    self.chat_text.config(state='disabled')
-                elif kind == 'status':
-                    self.status_var.set(formatted)
                     try:
-                        import re
-                        m = re.search(r'Turn\s*(\d+)\s*/\s*(\d+)', formatted)
-                        if m:
-                            try:
-                                self.turn_count_var.set(f"{m.group(1)}/{m.group(2)}")
-                            except Exception:
-                                pass
+                        self._open_final_window()
                     except Exception:
                         pass
-                elif kind == 'done':
-                    self.start_btn.config(state='normal'); self.stop_btn.config(state='disabled'); self.status_var.set('Finished.')
-                    try:
-                        self.turn_count_var.set('')
-                    except Exception:
-                        pass
-                # Simplified: ignore intermediate merge-phase messages and only show final merged result
-                elif kind in ('initial_a', 'initial_b', 'critique_a', 'critique_b', 'draft_a', 'draft_b'):
-                    # intentionally ignored for the simplified UI
-                    pass
-                elif kind == 'merged_final':
-                    try:
-                        disp = self._reflow(formatted, width=100)
-                        # If final popup exists, update it; otherwise open the popup and populate it
+                    if hasattr(self, 'final_win_text') and getattr(self, 'final_win_text', None) is not None:
                         try:
-                            if hasattr(self, 'final_win_text') and getattr(self, 'final_win_text', None) is not None:
-                                self.final_win_text.config(state='normal')
-                                self.final_win_text.delete('1.0', 'end')
-                                self.final_win_text.insert('end', disp)
-                                self.final_win_text.see('end')
-                                self.final_win_text.config(state='disabled')
-                            else:
-                                try:
-                                    self._open_final_window()
-                                except Exception:
-                                    pass
-                                if hasattr(self, 'final_win_text') and getattr(self, 'final_win_text', None) is not None:
-                                    try:
-                                        self.final_win_text.config(state='normal')
-                                        self.final_win_text.delete('1.0', 'end')
-                                        self.final_win_text.insert('end', disp)
-                                        self.final_win_text.see('end')
-                                        self.final_win_text.config(state='disabled')
-                                    except Exception:
-                                        pass
+                            self.final_win_text.config(state='normal')
+                            self.final_win_text.delete('1.0', 'end')
+                            self.final_win_text.insert('end', disp)
+                            self.final_win_text.see('end')
+                            self.final_win_text.config(state='disabled')
                         except Exception:
                             pass
-                    except Exception:
-                        pass
-                elif kind == 'user':
-                    try:
-                        name = (self.sender_name.get().strip() if hasattr(self, 'sender_name') else '') or 'You'
-                        self.chat_text.config(state='normal')
-                        disp = self._reflow(formatted, width=100)
-                        self.chat_text.insert('end', f"{name}: {disp}\n\n")
-                        self.chat_text.see('end')
-                        self.chat_text.config(state='disabled')
-                    except Exception:
-                        pass
-        except queue.Empty:
+            except Exception:
+                pass
+        except Exception:
             pass
-        self.root.after(100, self._poll_queue)
 
     def start(self, greeting=None):
         if self.thread and self.thread.is_alive():
@@ -1979,50 +2470,43 @@ class OllamaGUI:
         except Exception:
             try: self.turn_count_var.set('')
             except Exception: pass
-        cfg = {
-            'a_url': self.a_url.get().strip(),
-            'a_name': self.a_name.get().strip() if hasattr(self, 'a_name') else 'Agent_A',
-            'a_model': self.a_model.get().strip(),
-            'a_persona': self.a_persona.get().strip(),
-            'a_persona_file': self.a_persona_file_settings.get().strip() if hasattr(self, 'a_persona_file_settings') else '',
-            'a_age': self.a_age.get().strip(),
-            'a_quirk': self.a_quirk.get().strip(),
-            'b_url': self.b_url.get().strip(),
-            'b_model': self.b_model.get().strip(),
-            'b_persona': self.b_persona.get().strip(),
-            'b_persona_file': self.b_persona_file_settings.get().strip() if hasattr(self, 'b_persona_file_settings') else '',
-            'b_age': self.b_age.get().strip(),
-            'b_quirk': self.b_quirk.get().strip(),
-            'topic': self.topic.get().strip(),
-            'turns': int(self.turns.get()),
+        # Plain string/int fields in one sweep each; the rest need per-field handling
+        cfg = {k: getattr(self, k).get().strip() for k in _START_STR_FIELDS}
+        cfg.update({k: int(getattr(self, k).get()) for k in _START_INT_FIELDS})
+        cfg.update({
+            'a_name': self.a_name.get().strip(),
+            'a_persona_file': self.a_persona_file_settings.get().strip(),
+            'b_persona_file': self.b_persona_file_settings.get().strip(),
+            'topic': self.topic_var.get().strip(),
             'delay': float(self.delay.get()),
             'humanize': bool(self.humanize_var.get()),
-            'greeting': (greeting or (self.greeting.get().strip() if hasattr(self, 'greeting') else '') ) or None,
-            'user_name': (self.sender_name.get().strip() if hasattr(self, 'sender_name') else '') or None,
-            'max_chars_a': int(self.max_chars_a.get()),
-            'max_chars_b': int(self.max_chars_b.get()),
+            'greeting': (greeting or self.greeting.get().strip()) or None,
+            'user_name': self.sender_name.get().strip() or None,
             'short_turn': bool(self.short_turn_var.get()),
             'log': bool(self.log_var.get()),
-            'log_path': self.log_path.get().strip() or None,
+            'log_path': self.log_path_var.get().strip() or None,
             'merge_final': bool(self.merge_final_var.get()) if getattr(self, 'merge_final_var', None) is not None else False,
             'a_runtime': {
                 'temperature': float(self.a_temp.get()),
                 'max_tokens': int(self.a_max_tokens.get()),
                 'top_p': float(self.a_top_p.get()),
-                'stop': [s.strip() for s in self.a_stop.get().split(',') if s.strip()],
+                'stop': list(filter(None, map(str.strip, self.a_stop_var.get().split(',')))),
                 'stream': bool(self.a_stream.get()),
             },
             'b_runtime': {
                 'temperature': float(self.b_temp.get()),
                 'max_tokens': int(self.b_max_tokens.get()),
                 'top_p': float(self.b_top_p.get()),
-                'stop': [s.strip() for s in self.b_stop.get().split(',') if s.strip()],
+                'stop': list(filter(None, map(str.strip, self.b_stop_var.get().split(',')))),
                 'stream': bool(self.b_stream.get()),
             },
-            'b_name': self.b_name.get().strip() if hasattr(self, 'b_name') else 'Agent_B',
-        }
+            'b_name': self.b_name.get().strip(),
+            'history_window': self.history_window,
+        })
+        cfg = ConversationConfig.from_dict(cfg)
         # create an inbound queue for injected user messages during a running conversation
-        self.to_worker_queue = queue.Queue()
+        # Injection channel: the worker only ever drains it with get_nowait, so no join/task_done needed
+        self.to_worker_queue = queue.SimpleQueue()
         self.thread = threading.Thread(target=self._run_conversation, args=(cfg, self.stop_event, self.queue, self.to_worker_queue), daemon=True)
         self.thread.start()
 
@@ -2031,32 +2515,101 @@ class OllamaGUI:
 
     def on_close(self):
         try:
+            # Don't wait on in-flight model fetches; queued ones are dropped
+            self._io_pool.shutdown(wait=False, cancel_futures=True)
             self.stop()
             if self.thread:
                 try:
-                    self.thread.join(timeout=1.0)
+                    self.thread.join(timeout=0.5)
                 except Exception:
                     pass
+            # The conversation may still be waiting on a chat call, so its own close of the log
+            # hasn't run yet: have the writer write and flush what is queued now
+            if self._chat_log:
+                log_q, writer = self._chat_log
+                log_q.put(None)
+                writer.join(timeout=1.0)
             try:
                 self.save_config()
             except Exception:
                 pass
         except Exception:
             pass
+        try:
+            exit_after = self.close_on_exit_var is not None and bool(self.close_on_exit_var.get())
+        except tk.TclError:
+            exit_after = False
         try:
             self.root.destroy()
         except Exception:
             pass
-        # Exit process only if the user enabled the option
+        # Exit the process only if the user enabled the option; sys.exit lets atexit and file
+        # flushes run, and the Ollama workers are daemon threads so in-flight calls don't hold it up
+        if exit_after:
+            import sys
+            sys.exit(0)
+
+    def _http_session(self):
+        # Shared keep-alive session for model list/pull/remove calls; transient 5xx on GETs are retried with backoff
+        if self._http is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            sess = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                  max_retries=Retry(total=_HTTP_RETRIES, backoff_factor=_HTTP_BACKOFF, status_forcelist=(502, 503, 504),
+                                                    allowed_methods=frozenset({'GET'})))
+            sess.mount('http://', adapter)
+            sess.mount('https://', adapter)
+            self._http = sess
+        return self._http
+
+    def _safe_config(self, w, **kw):
+        # Configure a widget that may not exist yet or may already be destroyed
+        if w is None:
+            return
         try:
-            if getattr(self, 'close_on_exit_var', None) and self.close_on_exit_var.get():
-                import os
-                os._exit(0)
-        except Exception:
+            w.configure(**kw)
+        except tk.TclError:
+            pass
+
+    def _set_merge_progress(self, text):
+        # Live-merge phase label, from the worker; a missing or closed progress window is ignored
+        self._post_config(getattr(self, 'merge_progress_label', None), text=text)
+
+    def _post_config(self, w, **kw):
+        # _safe_config from a worker thread: hand it to the Tk loop
+        if w is None:
+            return
+        self._post_ui(lambda: self._safe_config(w, **kw))
+
+    def _apply_status_color(self, sl, color):
+        if sl is None:
+            return
+        try:
+            sl.configure(text='●', foreground=color)
+        except tk.TclError:
+            pass
+
+    def _post_ui(self, fn, *args):
+        # Queue fn(*args) from any thread; a burst of posts is run by one after_idle flush
+        self._ui_ops.append((fn, args))
+        if not self._ui_scheduled:
+            self._ui_scheduled = True
+            try:
+                self.root.after_idle(self._flush_ui)
+            except (RuntimeError, tk.TclError):
+                self._ui_scheduled = False
+
+    def _flush_ui(self):
+        self._ui_scheduled = False
+        ops = self._ui_ops
+        while ops:
+            fn, args = ops.popleft()
             try:
-                import sys
-                sys.exit(0)
+                fn(*args)
             except Exception:
+                # one failed update (e.g. a destroyed widget) must not strand the rest
                 pass
 
     def _fetch_models(self, server_url, combobox, button, status_label=None, status_icon=None, agent=None):
@@ -2064,199 +2617,120 @@ class OllamaGUI:
         if agent == 'b_settings':
             self.b_model_list.delete(0, tk.END)
             self.b_model_list.insert(tk.END, '(Refreshing...)')
+            self._last_b_models = None
             self._add_model_status('Started refreshing models for agent B', 'info')
         def worker():
             try:
-                try:
-                    if button:
-                        try:
-                            self.root.after(0, lambda: button.config(state='disabled'))
-                        except Exception:
-                            button.config(state='disabled')
-                except Exception:
-                    pass
+                self._post_config(button, state='disabled')
                 if not server_url:
                     self.queue.put(('status', 'Server URL empty'))
-                    if status_label is not None:
-                        try:
-                            try:
-                                self.root.after(0, lambda: status_label.config(text='●', foreground='gray') if status_label is not None else None)
-                            except Exception:
-                                if status_label is not None:
-                                    status_label.config(text='●', foreground='gray')
-                        except Exception: pass
+                    self._post_ui(self._apply_status_color, status_label, 'gray')
                     if agent in ('a_settings', 'b_settings'):
-                        try:
-                            self.root.after(0, lambda: self._update_models_text(agent, []))
-                        except Exception:
-                            try: self._update_models_text(agent, [])
-                            except Exception: pass
+                        self._post_ui(self._update_models_text, agent, [])
                     return
                 endpoints = ['/models', '/v1/models', '/api/models']
                 models = []
                 last_exc = None
-                attempts = []
-                for ep in endpoints:
+                # Build every endpoint URL once; reused for the requests and the debug log
+                base = server_url.rstrip('/')
+                urls = {ep: base + ep for ep in endpoints}
+                # Only failures are recorded; the debug log is only written when nothing was found
+                errors = []
+
+                def probe(ep):
+                    url = urls[ep]
+                    resp = self._http_session().get(url, timeout=_MODELS_TIMEOUT)
+                    resp.raise_for_status()
+                    body = resp.content
                     try:
-                        url = server_url.rstrip('/') + ep
-                        attempts.append(f'GET {url}')
-                        req = urllib.request.Request(url)
-                        with urllib.request.urlopen(req, timeout=1) as resp:
-                            raw = resp.read()
+                        # json.loads detects UTF-8/16/32 from the bytes itself; no text decode needed
+                        return _extract_model_names(json.loads(body))
+                    except ValueError:
+                        txt = body.decode(resp.encoding or 'utf-8', errors='replace').strip()
+                        if '\n' in txt:
+                            return [l.strip() for l in txt.splitlines() if l.strip()]
+                        self.queue.put(('status', f'Got non-JSON response from {url}: {txt[:200]}'))
+                        return []
+
+                # Probe all endpoints at once, so a dead server costs one timeout rather than one
+                # per endpoint. The list still comes from the highest-priority endpoint (order of
+                # `endpoints`) that lists models: stop as soon as every endpoint ahead of the best
+                # hit so far has finished
+                futs = {_MODELS_POOL.submit(probe, ep): ep for ep in endpoints}
+                done = {}
+                try:
+                    for fut in concurrent.futures.as_completed(futs, timeout=_MODELS_WAIT):
+                        ep = futs[fut]
                         try:
-                            data = json.loads(raw.decode('utf-8', errors='ignore'))
-                        except Exception:
-                            txt = raw.decode('utf-8', errors='ignore').strip()
-                            if '\n' in txt:
-                                lines = [l.strip() for l in txt.splitlines() if l.strip()]
-                                models.extend(lines); break
-                            self.queue.put(('status', f'Got non-JSON response from {url}: {txt[:200]}'))
-                            continue
-                        if isinstance(data, list):
-                            for item in data:
-                                if isinstance(item, dict):
-                                    name = item.get('name') or item.get('model') or item.get('id')
-                                    if name: models.append(name)
-                                else:
-                                    models.append(str(item))
-                        elif isinstance(data, dict):
-                            for key in ('models', 'results', 'data'):
-                                if key in data and isinstance(data[key], list):
-                                    for item in data[key]:
-                                        if isinstance(item, dict):
-                                            n = item.get('name') or item.get('model') or item.get('id') or item.get('modelId')
-                                            if n: models.append(n)
-                            if not models:
-                                for v in data.values():
-                                    if isinstance(v, str): models.append(v)
-                        if models: break
-                    except Exception as ie:
-                        last_exc = ie; attempts.append(f'ERROR {ep}: {repr(ie)}'); continue
-
-                def _set_icon_color(col: str):
-                    try:
-                        if status_label is not None:
-                            color_map = {'green': 'green', 'red': 'red', 'gray': 'gray'}
-                            try:
-                                self.root.after(0, lambda: status_label.config(text='●', foreground=color_map.get(col, 'gray')) if status_label is not None else None)
-                            except Exception:
-                                if status_label is not None:
-                                    status_label.config(text='●', foreground=color_map.get(col, 'gray'))
-                    except Exception:
-                        pass
+                            done[ep] = fut.result()
+                        except Exception as ie:
+                            done[ep] = None; last_exc = ie; errors.append(f'ERROR {ep}: {ie!r}')
+                        for e in endpoints:
+                            if e not in done:
+                                break
+                            if done[e]:
+                                models = done[e]
+                                break
+                        if models:
+                            break
+                except concurrent.futures.TimeoutError as te:
+                    last_exc = te; errors.append('ERROR: timed out waiting for model endpoints')
+                    # A higher-priority endpoint never answered; fall back to the best one that did
+                    models = next((done[e] for e in endpoints if done.get(e)), [])
+                finally:
+                    # Drop probes that haven't started; running ones finish on the shared pool
+                    for fut in futs:
+                        fut.cancel()
 
                 if models:
-                    seen = set(); unique = []
-                    for m in models:
-                        if m not in seen:
-                            seen.add(m); unique.append(m)
-                    if combobox:
-                        try:
-                            try:
-                                try:
-                                    self.root.after(0, lambda: combobox.config(values=unique))
-                                except Exception:
-                                    combobox.config(values=unique)
-                                if unique:
-                                    try:
-                                        self.root.after(0, lambda: combobox.set(unique[0]))
-                                    except Exception:
-                                        combobox.set(unique[0])
-                            except Exception:
-                                pass
-                        except Exception:
-                            pass
-                    try:
-                        try:
-                            self.root.after(0, lambda: self._add_model_status(f'Loaded {len(unique)} models from {server_url}', 'info'))
-                        except Exception:
-                            self._add_model_status(f'Loaded {len(unique)} models from {server_url}', 'info')
-                    except Exception:
-                        pass
-                    # Always update the model list in the main GUI combobox as well
+                    # Order-preserving dedupe
+                    unique = list(dict.fromkeys(models))
+                    # Unchanged list (e.g. a refresh after pull/remove on the other agent's server):
+                    # keep the combobox values and the user's current selection
+                    key = tuple(unique)
+                    if combobox and self._fetched_models.get(agent) != key:
+                        self._fetched_models[agent] = key
+                        self._post_ui(lambda: combobox.config(values=unique))
+                        self._post_ui(combobox.set, unique[0])
+                    self._post_ui(self._add_model_status, f'Loaded {len(unique)} models from {server_url}', 'info')
                     # Always update the correct Listbox in Settings after fetch
-                    if agent == 'a_settings':
-                        try:
-                            self.root.after(0, lambda: self._update_models_text('a_settings', unique))
-                        except Exception:
-                            try: self._update_models_text('a_settings', unique)
-                            except Exception: pass
-                    if agent == 'b_settings':
-                        try:
-                            self.root.after(0, lambda: self._update_models_text('b_settings', unique))
-                        except Exception:
-                            try: self._update_models_text('b_settings', unique)
-                            except Exception: pass
-                    if status_label is not None:
-                        try: _set_icon_color('green')
-                        except Exception: pass
+                    if agent in ('a_settings', 'b_settings'):
+                        self._post_ui(self._update_models_text, agent, unique)
+                    self._post_ui(self._apply_status_color, status_label, 'green')
                 else:
-                    msg = f'No models found at {server_url}'
-                    if last_exc: msg += f': {repr(last_exc)}'
+                    # Format the failure once; the message and the debug record share it
+                    err_repr = repr(last_exc) if last_exc else ''
+                    self._fetched_models.pop(agent, None)
+                    msg = f'No models found at {server_url}' + (f': {err_repr}' if err_repr else '')
                     if agent:
-                        try:
-                            self.root.after(0, lambda: self._update_models_text(agent, []))
-                        except Exception:
-                            try: self._update_models_text(agent, [])
-                            except Exception: pass
+                        self._post_ui(self._update_models_text, agent, [])
                     try:
                         import datetime
+                        ts = datetime.datetime.now().isoformat()
                         dbg_path = 'model_fetch_debug.log'
+                        # One record, one write
+                        record = (f'[{ts}] Fetch models debug for {server_url}\n'
+                                  + '\n'.join([f'GET {u}' for u in urls.values()] + errors)
+                                  + (f'\nLast exception: {err_repr}' if err_repr else '') + '\n\n')
                         with open(dbg_path, 'a', encoding='utf-8') as df:
-                            df.write(f'[{datetime.datetime.now().isoformat()}] Fetch models debug for {server_url}\n')
-                            for a in attempts: df.write(a + '\n')
-                            if last_exc: df.write('Last exception: ' + repr(last_exc) + '\n')
-                            df.write('\n')
-                    except Exception:
-                        pass
-                    try:
-                        try:
-                            self.root.after(0, lambda: self._add_model_status(msg + ' (see model_fetch_debug.log)', 'error'))
-                        except Exception:
-                            self._add_model_status(msg + ' (see model_fetch_debug.log)', 'error')
+                            df.write(record)
                     except Exception:
                         pass
+                    self._post_ui(self._add_model_status, msg + ' (see model_fetch_debug.log)', 'error')
+                    # Modal: keep it out of the batched flush so it doesn't hold up the other updates
                     try:
-                        try:
-                            self.root.after(0, lambda: messagebox.showerror('Model Fetch Failed', msg + '\n\nSee model_fetch_debug.log for details.'))
-                        except Exception:
-                            messagebox.showerror('Model Fetch Failed', msg + '\n\nSee model_fetch_debug.log for details.')
-                    except Exception:
+                        self.root.after(0, lambda: messagebox.showerror('Model Fetch Failed', msg + '\n\nSee model_fetch_debug.log for details.'))
+                    except (RuntimeError, tk.TclError):
                         pass
-                    if status_label is not None:
-                        try: _set_icon_color('red')
-                        except Exception: pass
+                    self._post_ui(self._apply_status_color, status_label, 'red')
             except Exception as e:
-                self._add_model_status(f'Model fetch failed: {repr(e)}', 'error')
+                self._post_ui(self._add_model_status, f'Model fetch failed: {repr(e)}', 'error')
             finally:
-                try:
-                    if button:
-                        try:
-                            self.root.after(0, lambda: button.config(state='normal'))
-                        except Exception:
-                            button.config(state='normal')
-                except Exception: pass
+                self._post_config(button, state='normal')
                 if agent == 'b_settings':
-                    try:
-                        try:
-                            self.root.after(0, lambda: self._add_model_status('Finished refreshing models for agent B', 'info'))
-                        except Exception:
-                            self._add_model_status('Finished refreshing models for agent B', 'info')
-                    except Exception:
-                        pass
+                    self._post_ui(self._add_model_status, 'Finished refreshing models for agent B', 'info')
 
-        def run_and_force_update():
-            worker()
-            # Force update of the combobox UI in the main thread
-            if combobox:
-                try:
-                    try:
-                        self.root.after(0, combobox.update_idletasks)
-                    except Exception:
-                        combobox.update_idletasks()
-                except Exception:
-                    pass
-        threading.Thread(target=run_and_force_update, daemon=True).start()
+        self._io_pool.submit(worker)
 
     def _pull_now(self, server_url, model_name):
         pass
@@ -2268,46 +2742,95 @@ class OllamaGUI:
         pass
 
     def _pull_to_urls(self, url_list, model_name):
-        import requests
         if not url_list or not model_name:
             messagebox.showerror('Pull Model', 'No server URL or model name specified.')
             return
-        for server_url in url_list:
-            if not server_url:
-                continue
+        # Read the agent URLs here; the worker must not touch Tk widgets
+        a_url, b_url = self.a_url.get().strip(), self.b_url.get().strip()
+
+        def show(kind, title, text):
             try:
-                status_msg = f'Pulling model {model_name} to {server_url}...'
-                self._set_model_busy(status_msg)
-                self._add_model_status(status_msg, 'info')
-                url = server_url.rstrip('/') + '/api/pull'
-                resp = requests.post(url, json={"name": model_name}, timeout=30)
-                if resp.status_code == 200:
-                    success_msg = f'Model "{model_name}" pulled successfully to {server_url}.'
-                    self._add_model_status(success_msg, 'info')
-                    messagebox.showinfo('Pull Model', success_msg)
-                else:
-                    try:
-                        err = resp.json().get('error')
-                    except Exception:
-                        err = resp.text
-                    fail_msg = f'Failed to pull model to {server_url}: {err}'
-                    self._add_model_status(fail_msg, 'error')
-                    messagebox.showerror('Pull Model', fail_msg)
-            except Exception as e:
-                err_msg = f'Error pulling model to {server_url}: {e}'
-                self._add_model_status(err_msg, 'error')
-                messagebox.showerror('Pull Model', err_msg)
-            finally:
-                self._clear_model_busy()
-                # Refresh model list for the relevant agent
-                if server_url == self.a_url.get().strip():
-                    self._refresh_a_models()
-                elif server_url == self.b_url.get().strip():
-                    self._refresh_b_models()
+                self.root.after(0, lambda: getattr(messagebox, kind)(title, text))
+            except (RuntimeError, tk.TclError):
+                pass
+
+        def worker():
+            for server_url in url_list:
+                if not server_url:
+                    continue
+                key = (server_url, model_name)
+                try:
+                    status_msg = f'Pulling model {model_name} to {server_url}...'
+                    self._pulls[key] = (status_msg, None)
+                    self._post_ui(self._add_model_status, status_msg, 'info')
+                    url = server_url.rstrip('/') + '/api/pull'
+                    # /api/pull streams NDJSON progress frames for as long as the download runs;
+                    # read it incrementally so the timeout bounds the gap between frames, not the whole pull
+                    with self._http_session().post(url, json={"name": model_name}, stream=True, timeout=(5, 30)) as resp:
+                        last = {}
+                        if resp.status_code == 200:
+                            for frame in _iter_ndjson(resp.iter_content(chunk_size=16384)):
+                                if isinstance(frame, dict):
+                                    last = frame
+                                    if frame.get('error'):
+                                        break
+                                    # Plain dict write; _pull_ui_tick picks up the latest every 100 ms
+                                    total = frame.get('total')
+                                    pct = None
+                                    if total:
+                                        # Inline clamp: layer totals can be revised mid-download
+                                        pct = frame.get('completed', 0) * 100 // total
+                                        pct = 0 if pct < 0 else 100 if pct > 100 else pct
+                                    self._pulls[key] = (f'{model_name} @ {server_url}: {frame.get("status", "")}', pct)
+                        else:
+                            last = {'error': _error_text(resp)}
+                    if not last.get('error'):
+                        success_msg = f'Model "{model_name}" pulled successfully to {server_url}.'
+                        self._post_ui(self._add_model_status, success_msg, 'info')
+                        show('showinfo', 'Pull Model', success_msg)
+                    else:
+                        fail_msg = f'Failed to pull model to {server_url}: {last["error"]}'
+                        self._post_ui(self._add_model_status, fail_msg, 'error')
+                        show('showerror', 'Pull Model', fail_msg)
+                except Exception as e:
+                    err_msg = f'Error pulling model to {server_url}: {e}'
+                    self._post_ui(self._add_model_status, err_msg, 'error')
+                    show('showerror', 'Pull Model', err_msg)
+                finally:
+                    self._pulls.pop(key, None)
+                    # Refresh model list for the relevant agent
+                    if server_url == a_url:
+                        self._post_ui(self._refresh_a_models)
+                    elif server_url == b_url:
+                        self._post_ui(self._refresh_b_models)
+
+        # Register every target up front so the tick keeps running until the last one is done
+        for server_url in url_list:
+            if server_url:
+                self._pulls.setdefault((server_url, model_name), (f'{model_name} @ {server_url}: waiting', None))
+        if not self._pull_ticking:
+            self._pull_ticking = True
+            self._pull_ui_tick()
+        # A pull can stream for minutes: give it its own daemon thread so it neither ties up
+        # _io_pool's fetch workers nor keeps the process alive after the window closes
+        threading.Thread(target=worker, daemon=True, name='ollama-pull').start()
+
+    def _pull_ui_tick(self):
+        # One label update per 100 ms however fast the pulls stream progress frames;
+        # stops only once no pull is active
+        active = tuple(self._pulls.values())
+        if not active:
+            self._pull_ticking = False
+            self._clear_model_busy()
+            return
+        self.model_busy_var.set(' | '.join(msg if pct is None else f'{msg} {pct}%' for msg, pct in active))
+        try:
+            self.root.after(100, self._pull_ui_tick)
+        except (RuntimeError, tk.TclError):
+            self._pull_ticking = False
 
     def _remove_model(self, server_url, model_name):
         # Remove a model from the Ollama server using the correct API endpoint
-        import requests
         if not server_url or not model_name:
             messagebox.showerror('Remove Model', 'No server URL or model name specified.')
             return
@@ -2315,23 +2838,20 @@ class OllamaGUI:
             self._set_model_busy(f'Removing model {model_name}...')
             # Ollama expects DELETE /api/delete with JSON body: {"name": "modelname"}
             url = server_url.rstrip('/') + '/api/delete'
-            resp = requests.delete(url, json={"name": model_name}, timeout=10)
+            resp = self._http_session().delete(url, json={"name": model_name}, timeout=10)
             if resp.status_code == 200:
                 messagebox.showinfo('Remove Model', f'Model "{model_name}" removed successfully.')
             else:
-                try:
-                    err = resp.json().get('error')
-                except Exception:
-                    err = resp.text
-                messagebox.showerror('Remove Model', f'Failed to remove model: {err}')
+                messagebox.showerror('Remove Model', f'Failed to remove model: {_error_text(resp)}')
         except Exception as e:
             messagebox.showerror('Remove Model', f'Error removing model: {e}')
         finally:
             self._clear_model_busy()
             # Refresh model list for the relevant agent
-            if server_url == self.a_url.get().strip():
+            a_url, b_url = self.a_url.get().strip(), self.b_url.get().strip()
+            if server_url == a_url:
                 self._refresh_a_models()
-            elif server_url == self.b_url.get().strip():
+            elif server_url == b_url:
                 self._refresh_b_models()
 
     def _apply_preset(self, preset_name, age_cb, quirk_cb, persona_entry):
@@ -2404,51 +2924,38 @@ class OllamaGUI:
         # restore default presets
         self.load_personas()
         try:
-            preset_names = list(self.persona_presets.keys())
+            preset_names = self._persona_names
             self.a_preset['values'] = preset_names; self.b_preset['values'] = preset_names
             if preset_names: self.a_preset.set(preset_names[0]); self.b_preset.set(preset_names[0])
         except Exception: pass
         # clear persona file selections by default
-        try:
-            if hasattr(self, 'a_persona_file_settings'):
-                try: self.a_persona_file_settings.set('')
-                except Exception: pass
-            if hasattr(self, 'b_persona_file_settings'):
-                try: self.b_persona_file_settings.set('')
-                except Exception: pass
-        except Exception:
-            pass
+        try: self.a_persona_file_settings.set('')
+        except Exception: pass
+        try: self.b_persona_file_settings.set('')
+        except Exception: pass
         self.queue.put(('status', 'Defaults restored'))
         try: self.save_config()
         except Exception: pass
 
     def _run_conversation(self, cfg, stop_event, out_queue, in_queue=None):
         log_file = None
+        log_q = None
         content_a = ''
         content_b = ''
+        if isinstance(cfg, dict):
+            cfg = ConversationConfig.from_dict(cfg)
         try:
-            topic = cfg['topic']
+            topic = cfg.topic
             try:
                 out_queue.put(('status', f"Using topic: {topic}"))
             except Exception:
                 pass
-            def build_persona(base, age, quirk):
-                parts = []
-                if base: parts.append(base)
-                if age: parts.append(f"Age: {age}")
-                if quirk: parts.append(f"Quirk: {quirk}")
-                return ' | '.join(parts) if parts else ''
-
-            persona_a = build_persona(cfg.get('a_persona'), cfg.get('a_age'), cfg.get('a_quirk'))
-            persona_b = build_persona(cfg.get('b_persona'), cfg.get('b_age'), cfg.get('b_quirk'))
-
-            name_a = cfg.get('a_name') or 'Agent_A'
-            name_b = cfg.get('b_name') or 'Agent_B'
-            instruction = (
-                "Important: In every reply, explicitly reference the discussion topic and keep responses focused on it. "
-                "Begin each response by briefly restating the topic and avoid unrelated tangents."
-            )
-            user_name = cfg.get('user_name')
+            persona_a = _build_persona(cfg.a_persona, cfg.a_age, cfg.a_quirk)
+            persona_b = _build_persona(cfg.b_persona, cfg.b_age, cfg.b_quirk)
+
+            name_a = cfg.a_name or 'Agent_A'
+            name_b = cfg.b_name or 'Agent_B'
+            user_name = cfg.user_name
             user_note = f" The human user's name is {user_name}." if user_name else ''
 
             # Inject short memory summary (Stage 1) if available
@@ -2459,16 +2966,16 @@ class OllamaGUI:
                 mem_summary = ''
             mem_note = f" Memory summary: {mem_summary}." if mem_summary else ''
 
-            sys_a = f"{instruction} You are {name_a}. Discuss '{topic}' with {name_b}. {persona_a}.{user_note}{mem_note}".strip()
-            sys_b = f"{instruction} You are {name_b}. Discuss '{topic}' with {name_a}. {persona_b}.{user_note}{mem_note}".strip()
+            sys_a = _system_prompt(name_a, name_b, topic, persona_a, user_note + mem_note)
+            sys_b = _system_prompt(name_b, name_a, topic, persona_b, user_note + mem_note)
 
             messages_a = [{'role': 'system', 'content': sys_a}]
             messages_b = [{'role': 'system', 'content': sys_b}]
 
             # Prefer an explicit greeting passed to start(); otherwise follow the humanize/topic settings
-            if cfg.get('greeting'):
-                initial_prompt = cfg.get('greeting')
-            elif cfg.get('humanize'):
+            if cfg.greeting:
+                initial_prompt = cfg.greeting
+            elif cfg.humanize:
                 initial_prompt = 'Hello, how are you?'
             else:
                 initial_prompt = f"Let's discuss {topic}. I think..."
@@ -2483,30 +2990,45 @@ class OllamaGUI:
                 pass
             # initial prompt recorded locally (no persistent brain)
 
-            turns = cfg['turns']; delay = cfg['delay']
-            a_url = cfg['a_url']; b_url = cfg['b_url']
-            a_model = cfg['a_model']; b_model = cfg['b_model']
+            turns = cfg.turns; delay = cfg.delay
+            a_url = cfg.a_url; b_url = cfg.b_url
+            a_model = cfg.a_model; b_model = cfg.b_model
+            # Per-turn chat options never change during a run
+            a_opts = cfg.a_runtime.options(); b_opts = cfg.b_runtime.options()
+            keep = 2 * max(1, cfg.history_window)
 
             log_file = None
-            if cfg.get('log') and cfg.get('log_path'):
-                try: log_file = open(cfg.get('log_path'), 'a', encoding='utf-8')
+            if cfg.log and cfg.log_path:
+                try: log_file = open(cfg.log_path, 'a', buffering=1 << 16, encoding='utf-8')
                 except Exception: log_file = None
+            if log_file:
+                # Disk writes happen on a writer thread so a slow flush never delays the next turn
+                log_q = queue.SimpleQueue()
+                writer = threading.Thread(target=self._log_writer, args=(log_file, log_q), daemon=True, name='chat-log')
+                writer.start()
+                self._chat_log = (log_q, writer)
 
             def ts():
                 from datetime import datetime
                 return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
+            # Fixed for the whole run; read once instead of on every reply
+            max_chars = {'a': cfg.max_chars_a, 'b': cfg.max_chars_b}
+            short_turn = cfg.short_turn
+            sender = cfg.user_name
+            # Short turns keep only the first sentence, so stop streaming once it has arrived
+            stop_at = _SENT_END_RE.search if short_turn else None
+
             def trunc(text: str, agent: str) -> str:
                 if not text: return ''
                 t = text.strip()
-                maxc = cfg.get('max_chars_a') if agent == 'a' else cfg.get('max_chars_b')
-                if cfg.get('short_turn'):
-                    import re
-                    m = re.search(r"(.+?[.!?])(\s|$)", t, re.S)
+                maxc = max_chars[agent]
+                if short_turn:
+                    m = _FIRST_SENT_RE.search(t)
                     if m:
                         s = m.group(1).strip()
                     else:
-                        parts = re.split(r'[,;:\-]\s*', t, maxsplit=1)
+                        parts = _SPLIT_CLAUSE_RE.split(t, maxsplit=1)
                         s = parts[0].strip()
                     limit = maxc if maxc and maxc > 0 else 120
                     if len(s) <= limit:
@@ -2529,6 +3051,19 @@ class OllamaGUI:
                     return cut
                 return t
 
+            def looks_cut_off(s: str, agent: str) -> bool:
+                if not s: return False
+                s = s.strip()
+                if s.endswith(('.', '!', '?')): return False
+                if s.endswith('…') or s.endswith('...') or s.endswith('..'):
+                    return True
+                # if last char is a letter or digit, likely mid-sentence
+                if s and s[-1].isalnum():
+                    # only attempt if the reply is reasonably long (likely truncated by tokens)
+                    if len(s) > (max_chars[agent] or 120) - 20:
+                        return True
+                return False
+
 
             for i in range(turns):
                 if stop_event.is_set():
@@ -2571,12 +3106,8 @@ class OllamaGUI:
                                     try:
                                         content = um.strip()
                                         # Prepend sender name if available so agents see who sent it
-                                        try:
-                                            sender = cfg.get('user_name')
-                                            if sender:
-                                                content = f"{sender}: {content}"
-                                        except Exception:
-                                            pass
+                                        if sender:
+                                            content = f"{sender}: {content}"
                                     except Exception:
                                         content = um.strip()
                                     try:
@@ -2604,13 +3135,7 @@ class OllamaGUI:
                     pass
 
                 # pass runtime options for Agent B
-                b_runtime = {
-                    'temperature': float(cfg.get('b_runtime', {}).get('temperature', 0.7)),
-                    'max_tokens': int(cfg.get('b_runtime', {}).get('max_tokens', 512)),
-                    'top_p': float(cfg.get('b_runtime', {}).get('top_p', 1.0)),
-                    'stop': cfg.get('b_runtime', {}).get('stop') or None,
-                    'stream': bool(cfg.get('b_runtime', {}).get('stream', False)),
-                }
+                b_runtime = b_opts
                 # Per-turn relevance: pick a few facts relevant to recent context and include as a short system note
                 try:
                     context_for_retrieval = topic or ''
@@ -2631,23 +3156,11 @@ class OllamaGUI:
                 else:
                     messages_b_call = messages_b
 
-                resp_b = self._call_ollama_with_timeout(b_url, b_model, messages_b_call, runtime_options=b_runtime, timeout=20)
+                resp_b = self._call_ollama_with_timeout(b_url, b_model, messages_b_call, runtime_options=b_runtime, timeout=20, until=stop_at)
                 raw_b = (resp_b.get('content','') or '').strip() if isinstance(resp_b, dict) else str(resp_b)
                 # If the model reply looks cut off (no terminal punctuation) try one short continuation
                 try:
-                    def looks_cut_off(s: str) -> bool:
-                        if not s: return False
-                        s = s.strip()
-                        if s.endswith(('.', '!', '?')): return False
-                        if s.endswith('…') or s.endswith('...') or s.endswith('..'):
-                            return True
-                        # if last char is a letter or digit, likely mid-sentence
-                        if s and s[-1].isalnum():
-                            # only attempt if the reply is reasonably long (likely truncated by tokens)
-                            if len(s) > (cfg.get('max_chars_b') or 120) - 20:
-                                return True
-                        return False
-                    if looks_cut_off(raw_b):
+                    if looks_cut_off(raw_b, 'b'):
                         try:
                             cont_msg = list(messages_b_call) + [{'role':'system','content':'The previous response appears to have been cut off. Please continue and finish the previous answer concisely.'}]
                             cont_resp = self._call_ollama_with_timeout(b_url, b_model, cont_msg, runtime_options=b_runtime, timeout=12)
@@ -2668,24 +3181,15 @@ class OllamaGUI:
                 except Exception:
                     pass
                 # brain logging removed
-                if log_file:
-                    try:
-                        log_file.write(f"[{ts()}] B: {content_b}\n"); log_file.flush()
-                    except Exception:
-                        pass
+                if log_q:
+                    log_q.put(f"[{ts()}] B: {content_b}\n")
                 messages_b.append({'role': 'assistant', 'content': content_b})
                 messages_a.append({'role': 'user', 'content': content_b})
 
                 if stop_event.is_set():
                     break
 
-                a_runtime = {
-                    'temperature': float(cfg.get('a_runtime', {}).get('temperature', 0.7)),
-                    'max_tokens': int(cfg.get('a_runtime', {}).get('max_tokens', 512)),
-                    'top_p': float(cfg.get('a_runtime', {}).get('top_p', 1.0)),
-                    'stop': cfg.get('a_runtime', {}).get('stop') or None,
-                    'stream': bool(cfg.get('a_runtime', {}).get('stream', False)),
-                }
+                a_runtime = a_opts
                 try:
                     context_for_retrieval = topic or ''
                     for m in reversed(messages_a):
@@ -2704,20 +3208,10 @@ class OllamaGUI:
                 else:
                     messages_a_call = messages_a
 
-                resp_a = self._call_ollama_with_timeout(a_url, a_model, messages_a_call, runtime_options=a_runtime, timeout=20)
+                resp_a = self._call_ollama_with_timeout(a_url, a_model, messages_a_call, runtime_options=a_runtime, timeout=20, until=stop_at)
                 raw_a = (resp_a.get('content','') or '').strip() if isinstance(resp_a, dict) else str(resp_a)
                 try:
-                    def looks_cut_off_a(s: str) -> bool:
-                        if not s: return False
-                        s = s.strip()
-                        if s.endswith(('.', '!', '?')): return False
-                        if s.endswith('…') or s.endswith('...') or s.endswith('..'):
-                            return True
-                        if s and s[-1].isalnum():
-                            if len(s) > (cfg.get('max_chars_a') or 120) - 20:
-                                return True
-                        return False
-                    if looks_cut_off_a(raw_a):
+                    if looks_cut_off(raw_a, 'a'):
                         try:
                             cont_msg_a = list(messages_a_call) + [{'role':'system','content':'The previous response appears to have been cut off. Please continue and finish the previous answer concisely.'}]
                             cont_resp_a = self._call_ollama_with_timeout(a_url, a_model, cont_msg_a, runtime_options=a_runtime, timeout=12)
@@ -2737,18 +3231,18 @@ class OllamaGUI:
                 except Exception:
                     pass
                 # brain logging removed
-                if log_file:
-                    try:
-                        log_file.write(f"[{ts()}] A: {content_a}\n"); log_file.flush()
-                    except Exception:
-                        pass
+                if log_q:
+                    log_q.put(f"[{ts()}] A: {content_a}\n")
                 messages_a.append({'role': 'assistant', 'content': content_a})
                 messages_b.append({'role': 'user', 'content': content_a})
+                # Keep the system prompt plus the last history_window exchanges so request size stays flat
+                for msgs in (messages_a, messages_b):
+                    if len(msgs) > 1 + keep:
+                        del msgs[1:len(msgs) - keep]
 
-                # Only sleep if not stopping
-                if stop_event.is_set():
+                # Pause between turns, waking immediately if Stop is pressed
+                if stop_event.wait(delay):
                     break
-                time.sleep(delay)
 
         except Exception as e:
             try:
@@ -2762,10 +3256,9 @@ class OllamaGUI:
                 try: out_queue.put(('status', f'Error: {e}'))
                 except Exception: pass
         finally:
-            try:
-                if log_file: log_file.close()
-            except Exception:
-                pass
+            # The writer flushes what is queued, then closes the file
+            if log_q:
+                log_q.put(None)
 
             # If requested, ask both models to produce a merged final answer
             try:
@@ -2791,7 +3284,7 @@ class OllamaGUI:
                                     {'role': 'system', 'content': 'You are an objective critic.'},
                                     {'role': 'user', 'content': critique_text_a}
                                 ]
-                                res_crit_a = self._call_ollama_with_timeout(cfg.get('a_url', ''), cfg.get('a_model', ''), critique_msg_a, runtime_options=cfg.get('a_runtime', {}), timeout=15)
+                                res_crit_a = self._call_ollama_with_timeout(cfg.a_url, cfg.a_model, critique_msg_a, runtime_options=asdict(cfg.a_runtime), timeout=15)
                             except Exception:
                                 res_crit_a = {'content': ''}
                             try:
@@ -2805,7 +3298,7 @@ class OllamaGUI:
                                     {'role': 'system', 'content': 'You are an objective critic.'},
                                     {'role': 'user', 'content': critique_text_b}
                                 ]
-                                res_crit_b = self._call_ollama_with_timeout(cfg.get('b_url', ''), cfg.get('b_model', ''), critique_msg_b, runtime_options=cfg.get('b_runtime', {}), timeout=15)
+                                res_crit_b = self._call_ollama_with_timeout(cfg.b_url, cfg.b_model, critique_msg_b, runtime_options=asdict(cfg.b_runtime), timeout=15)
                             except Exception:
                                 res_crit_b = {'content': ''}
                             critique_a = (res_crit_a.get('content','') or '').strip()
@@ -2827,7 +3320,7 @@ class OllamaGUI:
                             try:
                                 merge_text = (
                                     "Phase: final_merge.\n"
-                                    f"Question: {cfg.get('topic','')}\n"
+                                    f"Question: {cfg.topic}\n"
                                     f"Answer A: {final_a}\n"
                                     f"Answer B: {final_b}\n"
                                     f"Critique A: {critique_a}\n"
@@ -2838,11 +3331,11 @@ class OllamaGUI:
                                     {'role': 'system', 'content': 'You are an expert assistant that merges and synthesizes answers.'},
                                     {'role': 'user', 'content': merge_text}
                                 ]
-                                res_a = self._call_ollama_with_timeout(cfg.get('a_url', ''), cfg.get('a_model', ''), msg, runtime_options=cfg.get('a_runtime', {}), timeout=20)
+                                res_a = self._call_ollama_with_timeout(cfg.a_url, cfg.a_model, msg, runtime_options=asdict(cfg.a_runtime), timeout=20)
                             except Exception:
                                 res_a = {'content': ''}
                             try:
-                                res_b = self._call_ollama_with_timeout(cfg.get('b_url', ''), cfg.get('b_model', ''), msg, runtime_options=cfg.get('b_runtime', {}), timeout=20)
+                                res_b = self._call_ollama_with_timeout(cfg.b_url, cfg.b_model, msg, runtime_options=asdict(cfg.b_runtime), timeout=20)
                             except Exception:
                                 res_b = {'content': ''}
                             draft_a = (res_a.get('content', '') or '').strip()
@@ -2854,7 +3347,7 @@ class OllamaGUI:
                                     f"Draft A:\n{draft_a}\n\nDraft B:\n{draft_b}\n\nFinal Answer:\n"
                                 )
                                 synth_msg = [{'role': 'system', 'content': 'You are an expert assistant that synthesizes and refines content.'}, {'role': 'user', 'content': synth_prompt}]
-                                synth_res = self._call_ollama_with_timeout(cfg.get('a_url', ''), cfg.get('a_model', ''), synth_msg, runtime_options=cfg.get('a_runtime', {}), timeout=20)
+                                synth_res = self._call_ollama_with_timeout(cfg.a_url, cfg.a_model, synth_msg, runtime_options=asdict(cfg.a_runtime), timeout=20)
                                 final_merged = (synth_res.get('content', '') or '').strip()
                             except Exception:
                                 final_merged = draft_a or draft_b
@@ -2885,6 +3378,18 @@ class OllamaGUI:
                 pass
 
 
+_QUEUE_HANDLERS = {
+    'a': OllamaGUI._q_chat,
+    'b': OllamaGUI._q_chat,
+    'user': OllamaGUI._q_chat,
+    'status': OllamaGUI._q_status,
+    'done': OllamaGUI._q_done,
+    'merged_final': OllamaGUI._q_final,
+    'a_status': OllamaGUI._q_dot,
+    'b_status': OllamaGUI._q_dot,
+}
+
+
 def main():
     root = tk.Tk()
     app = OllamaGUI(root)
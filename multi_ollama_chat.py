@@ -6,7 +6,10 @@ multi_ollama_chat.py - CLI for running a conversation between two Ollama agents.
 """
 
 import argparse
+import functools
 import os
+import re
+import selectors
 import sys
 import time
 import threading
@@ -35,11 +38,120 @@ AGENT_B_URL = os.getenv('AGENT_B_URL', 'http://192.168.127.121:11434')
 AGENT_B_MODEL = os.getenv('AGENT_B_MODEL', 'llama2')
 AGENT_B_NAME = os.getenv('AGENT_B_NAME', 'Agent_B')
 
+# One ollama.Client per (host, timeout): its underlying httpx pool keeps connections alive across turns
+_CLIENTS = {}
+
+
+def _get_client(client_url, timeout):
+    client = _CLIENTS.get((client_url, timeout))
+    if client is None:
+        client = _CLIENTS.setdefault((client_url, timeout), ollama.Client(host=client_url, timeout=timeout))
+    return client
+
+
+# Reply clean-up patterns, compiled once; clean_content runs on every reply
+# Any of these means the text is (part of) a stringified response object that needs scrubbing
+_RE_NEEDS_SCRUB = re.compile(r"content=|Message\(|\b(?:model|created_at|done|total_duration)=")
+_RE_MESSAGE_CONTENT = re.compile(r"Message\([^)]*content=(?:\'|\")(.*?)(?:\'|\")(?:,|\))", re.S)
+_RE_CONTENT = re.compile(r"content=(?:\'|\")(?P<c>.*?)(?:\'|\")", re.S)
+_RE_RESPONSE_FIELDS = re.compile(r"\b(?:model|created_at|done|total_duration)=[^\s,]+")
+_RE_MESSAGE_REPR = re.compile(r"message=Message\([^)]*\)")
+_RE_SPEAKER_PREFIX = re.compile(r"(?m)^(Agent_[AB]:\s*)+")
+_RE_SPEAKER_TAG = re.compile(r"Agent_[AB]:")
+_RE_BLANK_LINES = re.compile(r"\n{2,}")
+_RE_ELLIPSIS = re.compile(r"\.{2,}")
+_RE_REPEATED_PUNCT = re.compile(r"([!?\.]){2,}")
+_RE_PUNCT_NO_SPACE = re.compile(r"([\.\!\?])([^\s\.,!\?])")
+_RE_MULTI_SPACE = re.compile(r"[ \t]{2,}")
+_RE_SPELL_TOKEN = re.compile(r"^(\W*)([\w'-]+)(\W*)$")
+_RE_SPELL_SKIP = re.compile(r"[=\"'`/\\:.@#]")
+_RE_SPELL_WORD = re.compile(r"[A-Za-z'-]{2,}")
+_RE_FIRST_SENTENCE = re.compile(r"(.+?[.!?])(\s|$)", re.S)
+_RE_SENT_END = re.compile(r"[.!?]\s")
+_RE_WORDS = re.compile(r"\w+")
+# Curly quotes and long dashes to their ASCII forms, applied in one translate() pass
+_QUOTE_DASH_TRANS = str.maketrans({'\u201c': '"', '\u201d': '"', '\u2018': "'", '\u2019': "'", '\u2014': '-', '\u2013': '-'})
+
+# autocorrect.Speller loads its word list on construction; build it once, on first use
+_speller = None
+
+
+def _get_speller():
+    global _speller
+    if _speller is None:
+        try:
+            from autocorrect import Speller
+            _speller = Speller(lang='en')
+        except Exception:
+            _speller = False
+    return _speller or None
+
+
+@functools.lru_cache(maxsize=4096)
+def _spell_word(word):
+    # Speller builds edit-distance candidates for every unknown word; replies repeat words a lot
+    return _get_speller()(word)
+
+
+def extract_from_text(text: str) -> str:
+    if not text:
+        return ''
+    m2 = _RE_MESSAGE_CONTENT.search(text)
+    if m2:
+        return m2.group(1)
+    m = _RE_CONTENT.search(text)
+    if m:
+        return m.group('c')
+    return text
+
+
+def clean_content(text: str, spellcheck: bool = True) -> str:
+    if not text:
+        return ''
+    s = str(text)
+    # Plain reply text (the usual case) skips the repr-scrubbing passes
+    if _RE_NEEDS_SCRUB.search(s):
+        s = extract_from_text(s)
+        s = _RE_RESPONSE_FIELDS.sub('', s)
+        s = _RE_MESSAGE_REPR.sub('', s)
+    s = _RE_SPEAKER_PREFIX.sub('', s)
+    s = _RE_SPEAKER_TAG.sub('', s)
+    s = _RE_BLANK_LINES.sub('\n', s)
+    lines = [ln.strip() for ln in s.splitlines()]
+    s = ' '.join([ln for ln in lines if ln != ''])
+    s = s.translate(_QUOTE_DASH_TRANS)
+    s = _RE_ELLIPSIS.sub('...', s)
+    s = _RE_REPEATED_PUNCT.sub(r"\1", s)
+    s = _RE_PUNCT_NO_SPACE.sub(r"\1 \2", s)
+    s = _RE_MULTI_SPACE.sub(' ', s)
+    if spellcheck and _get_speller() is not None:
+        try:
+            def _spell_token(tok: str) -> str:
+                m = _RE_SPELL_TOKEN.match(tok)
+                if m:
+                    pre, word, post = m.groups()
+                    if _RE_SPELL_SKIP.search((pre or '') + (post or '')):
+                        return pre + word + (post or '')
+                    if _RE_SPELL_WORD.fullmatch(word):
+                        corrected = _spell_word(word)
+                        return pre + corrected + (post or '')
+                    return pre + word + (post or '')
+                return tok
+            tokens = s.split(' ')
+            s = ' '.join(_spell_token(t) for t in tokens)
+        except Exception:
+            pass
+    return s.strip()
 
 
-def chat_with_ollama(client_url, model, messages, timeout=30, runtime_options=None):
-    """Sends messages to an Ollama server and returns a dict with 'content'."""
-    client = ollama.Client(host=client_url)
+def chat_with_ollama(client_url, model, messages, timeout=30, runtime_options=None, spellcheck=True):
+    """Sends messages to an Ollama server and returns a dict with 'content'.
+
+    ``timeout`` (seconds) is applied to the HTTP client, so a stalled server
+    releases the socket instead of blocking the calling thread forever.
+    ``spellcheck`` runs the reply through autocorrect (when installed).
+    """
+    client = _get_client(client_url, timeout)
     try:
         # Try to pass runtime options (temperature, max_tokens, top_p, stop, stream, etc.)
         if runtime_options and isinstance(runtime_options, dict):
@@ -52,82 +164,97 @@ def chat_with_ollama(client_url, model, messages, timeout=30, runtime_options=No
     except Exception as e:
         return {"content": f"[ERROR calling {client_url}: {e}]"}
 
-    def extract_from_text(text: str) -> str:
-        import re
-        if not text:
-            return ''
-        m2 = re.search(r"Message\([^)]*content=(?:\'|\")(.*?)(?:\'|\")(?:,|\))", text, re.S)
-        if m2:
-            return m2.group(1)
-        m = re.search(r"content=(?:\'|\")(?P<c>.*?)(?:\'|\")", text, re.S)
-        if m:
-            return m.group('c')
-        return text
-
-    def clean_content(text: str) -> str:
-        import re
-        if not text:
-            return ''
-        s = str(text)
-        s = extract_from_text(s)
-        s = re.sub(r"\bmodel=[^\s,]+", '', s)
-        s = re.sub(r"\bcreated_at=[^\s,]+", '', s)
-        s = re.sub(r"\bdone=[^\s,]+", '', s)
-        s = re.sub(r"\btotal_duration=[^\s,]+", '', s)
-        s = re.sub(r"message=Message\([^)]*\)", '', s)
-        s = re.sub(r"(?m)^(Agent_[AB]:\s*)+", '', s)
-        s = re.sub(r"Agent_[AB]:", '', s)
-        s = re.sub(r"\n{2,}", '\n', s)
-        lines = [ln.strip() for ln in s.splitlines()]
-        s = ' '.join([ln for ln in lines if ln != ''])
-        s = s.replace('“', '"').replace('”', '"').replace('‘', "'").replace('’', "'")
-        s = s.replace('—', '-').replace('–', '-')
-        s = re.sub(r"\.{2,}", '...', s)
-        s = re.sub(r"([!?\.]){2,}", r"\1", s)
-        s = re.sub(r"([\.\!\?])([^\s\.,!\?])", r"\1 \2", s)
-        s = re.sub(r"[ \t]{2,}", ' ', s)
-        try:
-            from autocorrect import Speller
-            sp = Speller(lang='en')
-            def _spell_token(tok: str) -> str:
-                m = re.match(r"^(\W*)([\w'-]+)(\W*)$", tok)
-                if m:
-                    pre, word, post = m.groups()
-                    if re.search(r"[=\"'`/\\:.@#]", (pre or '') + (post or '')):
-                        return pre + word + (post or '')
-                    if re.fullmatch(r"[A-Za-z'-]{2,}", word):
-                        corrected = sp(word)
-                        return pre + corrected + (post or '')
-                    return pre + word + (post or '')
-                return tok
-            tokens = s.split(' ')
-            s = ' '.join(_spell_token(t) for t in tokens)
-        except Exception:
-            pass
-        return s.strip()
+    # Dicts and current SDK response objects are both subscriptable: read the reply text
+    # directly instead of scraping it back out of the object's repr
+    try:
+        content = response['message']['content']
+    except Exception:
+        content = None
+    if isinstance(content, str) and content:
+        return {"content": clean_content(content, spellcheck)}
 
     if isinstance(response, dict):
         if 'message' in response:
             msg = response['message']
             if isinstance(msg, dict):
                 content = msg.get('content') or msg.get('text') or str(msg)
-                return {"content": clean_content(extract_from_text(content))}
-            return {"content": clean_content(extract_from_text(str(msg)))}
+                return {"content": clean_content(extract_from_text(content), spellcheck)}
+            return {"content": clean_content(extract_from_text(str(msg)), spellcheck)}
         if 'content' in response:
-            return {"content": clean_content(extract_from_text(response['content']))}
-    return {"content": clean_content(extract_from_text(str(response)))}
+            return {"content": clean_content(extract_from_text(response['content']), spellcheck)}
+    return {"content": clean_content(extract_from_text(str(response)), spellcheck)}
+
+
+def stream_chat_with_ollama(client_url, model, messages, timeout=30, runtime_options=None, until=None, spellcheck=True):
+    """Like chat_with_ollama, but streams the reply and stops reading once ``until(text)`` is true.
+
+    Closing the stream drops the connection, so the server stops generating the
+    part of the reply the caller was going to throw away.
+    """
+    client = _get_client(client_url, timeout)
+    opts = {k: v for k, v in (runtime_options or {}).items() if k != 'stream'}
+    text = ''
+    stream = None
+    try:
+        try:
+            stream = client.chat(model=model, messages=messages, stream=True, **opts)
+        except TypeError:
+            stream = client.chat(model=model, messages=messages, stream=True)
+        for part in stream:
+            try:
+                piece = part['message']['content']
+            except (KeyError, TypeError):
+                continue
+            if piece:
+                text += piece
+                if until is not None and until(text):
+                    break
+    except Exception as e:
+        if not text:
+            return {"content": f"[ERROR calling {client_url}: {e}]"}
+    finally:
+        close = getattr(stream, 'close', None)
+        if close:
+            try: close()
+            except Exception: pass
+    return {"content": clean_content(text, spellcheck)}
+
 
+def warm_up_models(targets, timeout=30):
+    """Load each (url, model) into server memory concurrently and wait up to ``timeout`` seconds.
 
-def run_conversation(topic, turns=5, delay=1.0, log_path=None, humanize=False, greeting=None, persona_a=None, persona_b=None, max_chars=None, short_turn=False, model_a=None, model_b=None):
+    An empty message list makes Ollama load the model without generating anything,
+    so the first real turn doesn't pay for a cold load on each server in turn.
+    """
+    def load(url, model):
+        try:
+            _get_client(url, timeout).chat(model=model, messages=[])
+        except Exception:
+            pass
+
+    threads = [threading.Thread(target=load, args=t, daemon=True) for t in dict.fromkeys(targets)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + timeout
+    for t in threads:
+        t.join(max(0.0, deadline - time.monotonic()))
+
+
+def run_conversation(topic, turns=5, delay=1.0, log_path=None, humanize=False, greeting=None, persona_a=None, persona_b=None, max_chars=None, short_turn=False, model_a=None, model_b=None, spellcheck=False, history_window=8, quiet=False):
     """Orchestrates a conversation between two agents. Each turn both agents reply.
 
     Args:
         topic (str): Topic to discuss.
         turns (int): Number of rounds (each round: B -> A).
         delay (float): Seconds to sleep between turns.
+        spellcheck (bool): Autocorrect replies; off by default as it dominates reply clean-up time.
+        history_window (int): Exchanges each agent keeps after its system prompt; older ones are dropped.
+        quiet (bool): Don't echo transcript lines to stdout; they still go to log_path.
     """
-    base_sys_a = f"You are {AGENT_A_NAME}. You are discussing the topic: '{topic}' with {AGENT_B_NAME}. Be concise and engaging."
-    base_sys_b = f"You are {AGENT_B_NAME}. You are discussing the topic: '{topic}' with {AGENT_A_NAME}. Be concise and engaging."
+    # The on-topic instruction lives in the system prompt, so off-topic retries don't have to append it
+    stay_on_topic = f" Stay strictly on topic: \"{topic}\". Give short, focused answers only about this topic."
+    base_sys_a = f"You are {AGENT_A_NAME}. You are discussing the topic: '{topic}' with {AGENT_B_NAME}. Be concise and engaging.{stay_on_topic}"
+    base_sys_b = f"You are {AGENT_B_NAME}. You are discussing the topic: '{topic}' with {AGENT_A_NAME}. Be concise and engaging.{stay_on_topic}"
 
     if persona_a:
         base_sys_a += f" Persona: {persona_a}"
@@ -164,30 +291,50 @@ def run_conversation(topic, turns=5, delay=1.0, log_path=None, humanize=False, g
     log_file = None
     if log_path:
         try:
-            log_file = open(log_path, 'a', encoding='utf-8')
+            log_file = open(log_path, 'a', encoding='utf-8', buffering=64 * 1024)
         except Exception:
             log_file = None
+    log_lock = threading.Lock()
+
+    # Entries are buffered; this pushes them to disk once a second instead of after every line
+    def log_flusher():
+        while not stop_event.wait(1.0):
+            try:
+                with log_lock:
+                    log_file.flush()
+            except Exception:
+                pass
 
-    # Input listener: use msvcrt on Windows for non-blocking console reads
+    if log_file:
+        threading.Thread(target=log_flusher, daemon=True).start()
+
+    # Input listener: waits for console input instead of polling for it
     def input_listener():
         try:
             if msvcrt:
+                # Blocking read; the daemon thread is torn down with the process
                 buf = ''
                 while not stop_event.is_set():
-                    if msvcrt.kbhit():
-                        ch = msvcrt.getwche()
-                        if ch in ('\r', '\n'):
-                            line = buf
-                            buf = ''
-                            if line.strip().lower() in ('stop', 'q', 'quit'):
-                                stop_event.set()
-                                break
-                        else:
-                            buf += ch
+                    ch = msvcrt.getwche()
+                    if ch in ('\r', '\n'):
+                        line = buf
+                        buf = ''
+                        if line.strip().lower() in ('stop', 'q', 'quit'):
+                            stop_event.set()
+                            break
                     else:
-                        time.sleep(0.1)
+                        buf += ch
             else:
+                # Wake at least every 0.5s so the thread notices stop_event; stdin that
+                # can't be selected on (e.g. some redirects) falls back to a plain readline
+                try:
+                    sel = selectors.DefaultSelector()
+                    sel.register(sys.stdin, selectors.EVENT_READ)
+                except Exception:
+                    sel = None
                 while not stop_event.is_set():
+                    if sel is not None and not sel.select(timeout=0.5):
+                        continue
                     line = sys.stdin.readline()
                     if not line:
                         break
@@ -200,17 +347,15 @@ def run_conversation(topic, turns=5, delay=1.0, log_path=None, humanize=False, g
     listener = threading.Thread(target=input_listener, daemon=True)
     listener.start()
 
-    transcript = []
-
     def log(message):
         timestamp = datetime.now().astimezone().strftime('%Y-%m-%d %H:%M:%S')
         entry = f"[{timestamp}] {message}"
-        transcript.append(entry)
-        print(entry)
+        if not quiet:
+            print(entry)
         if log_file:
             try:
-                log_file.write(entry + '\n')
-                log_file.flush()
+                with log_lock:
+                    log_file.write(entry + '\n')
             except Exception:
                 pass
 
@@ -224,29 +369,27 @@ def run_conversation(topic, turns=5, delay=1.0, log_path=None, humanize=False, g
         pass
 
     def truncate_text(text: str) -> str:
-        import re
         if not text:
             return ''
         # If short_turn, return first sentence-like chunk
         if short_turn:
-            m = re.search(r"(.+?[.!?])(\s|$)", text.strip(), re.S)
+            m = _RE_FIRST_SENTENCE.search(text.strip())
             if m:
                 return m.group(1).strip()
         if max_chars and isinstance(max_chars, int) and max_chars > 0:
             return text.strip()[:max_chars]
         return text.strip()
 
-    # quick topic similarity check (keyword overlap)
+    # quick topic similarity check (keyword overlap); the topic's words are fixed for the run
+    topic_words = frozenset(_RE_WORDS.findall(topic.lower())) if topic else frozenset()
+
     def topic_similarity(text: str, topic: str) -> float:
         try:
-            import re
-            if not text or not topic:
-                return 0.0
-            toks = re.findall(r"\w+", text.lower())
-            tset = set(re.findall(r"\w+", topic.lower()))
-            if not tset:
+            if not text or not topic_words:
                 return 0.0
-            common = sum(1 for t in toks if t in tset)
+            toks = _RE_WORDS.findall(text.lower())
+            # Count on-topic tokens with a C-level membership map instead of a generator
+            common = sum(map(topic_words.__contains__, toks))
             return common / max(1, len(toks))
         except Exception:
             return 0.0
@@ -255,6 +398,37 @@ def run_conversation(topic, turns=5, delay=1.0, log_path=None, humanize=False, g
     m_a = model_a or AGENT_A_MODEL
     m_b = model_b or AGENT_B_MODEL
 
+    # When replies get cut down anyway, stream them and stop reading once truncate_text
+    # has what it needs (first sentence, or max_chars with headroom for clean-up)
+    limit = max_chars if isinstance(max_chars, int) and max_chars > 0 else 0
+
+    def reply_done(text):
+        # short_turn keeps the whole first sentence even past max_chars, so only its end counts
+        if short_turn:
+            return _RE_SENT_END.search(text) is not None
+        return len(text) >= 2 * limit
+
+    # Both servers load their model at the same time instead of on each agent's first turn
+    warm_up_models([(AGENT_B_URL, m_b), (AGENT_A_URL, m_a)])
+
+    def ask(url, model, messages, runtime_options=None):
+        if short_turn or limit:
+            return stream_chat_with_ollama(url, model, messages, runtime_options=runtime_options, until=reply_done, spellcheck=spellcheck)
+        return chat_with_ollama(url, model, messages, runtime_options=runtime_options, spellcheck=spellcheck)
+
+    # An off-topic reply gets one cooler regeneration; the more on-topic of the two is kept
+    retry_options = {'options': {'temperature': 0.3, 'top_p': 0.7}}
+
+    def keep_on_topic(url, model, messages, content):
+        sim = topic_similarity(content, topic)
+        if sim >= 0.5 or stop_event.is_set():
+            return content
+        retry = truncate_text(ask(url, model, messages, retry_options).get('content', ''))
+        return retry if topic_similarity(retry, topic) > sim else content
+
+
+    # Only the system prompt plus the last few exchanges are resent, so per-turn prompt size stays bounded
+    keep = 2 * max(1, history_window)
 
     try:
         for i in range(turns):
@@ -264,23 +438,10 @@ def run_conversation(topic, turns=5, delay=1.0, log_path=None, humanize=False, g
             log(f"\n--- Turn {i+1} ---")
 
             # Agent B responds
-            response_b = chat_with_ollama(AGENT_B_URL, m_b, messages_b)
+            response_b = ask(AGENT_B_URL, m_b, messages_b)
             content_b = truncate_text(response_b.get('content', ''))
             # Enforce strict on-topic replies
-            for _ in range(2):
-                if stop_event.is_set():
-                    break
-                sim = topic_similarity(content_b, topic)
-                if sim < 0.5:  # much stricter threshold
-                    messages_b.append({'role': 'user', 'content': f'IMPORTANT: Stay strictly on topic: "{topic}". Give a short, focused answer only about this topic.'})
-                    response_b2 = chat_with_ollama(AGENT_B_URL, m_b, messages_b)
-                    content_b2 = truncate_text(response_b2.get('content', ''))
-                    if topic_similarity(content_b2, topic) > sim:
-                        content_b = content_b2
-                    if messages_b and messages_b[-1].get('role') == 'user' and 'IMPORTANT: Stay strictly on topic' in messages_b[-1].get('content',''):
-                        messages_b.pop()
-                else:
-                    break
+            content_b = keep_on_topic(AGENT_B_URL, m_b, messages_b, content_b)
             log(f"{AGENT_B_NAME}: {content_b}")
             messages_b.append({"role": "assistant", "content": content_b})
             messages_a.append({"role": "user", "content": content_b})
@@ -289,48 +450,36 @@ def run_conversation(topic, turns=5, delay=1.0, log_path=None, humanize=False, g
                 break
 
             # Agent A responds
-            response_a = chat_with_ollama(AGENT_A_URL, m_a, messages_a)
+            response_a = ask(AGENT_A_URL, m_a, messages_a)
             content_a = truncate_text(response_a.get('content', ''))
-            for _ in range(2):
-                if stop_event.is_set():
-                    break
-                sim = topic_similarity(content_a, topic)
-                if sim < 0.5:
-                    messages_a.append({'role': 'user', 'content': f'IMPORTANT: Stay strictly on topic: "{topic}". Give a short, focused answer only about this topic.'})
-                    response_a2 = chat_with_ollama(AGENT_A_URL, m_a, messages_a)
-                    content_a2 = truncate_text(response_a2.get('content', ''))
-                    if topic_similarity(content_a2, topic) > sim:
-                        content_a = content_a2
-                    if messages_a and messages_a[-1].get('role') == 'user' and 'IMPORTANT: Stay strictly on topic' in messages_a[-1].get('content',''):
-                        messages_a.pop()
-                else:
-                    break
+            content_a = keep_on_topic(AGENT_A_URL, m_a, messages_a, content_a)
             log(f"{AGENT_A_NAME}: {content_a}")
             messages_a.append({"role": "assistant", "content": content_a})
             messages_b.append({"role": "user", "content": content_a})
+            for msgs in (messages_a, messages_b):
+                if len(msgs) > keep + 1:
+                    del msgs[1:len(msgs) - keep]
 
-            # Make stopping more responsive: sleep in small increments
-            slept = 0.0
-            while slept < delay:
-                if stop_event.is_set():
-                    break
-                time.sleep(min(0.05, delay - slept))
-                slept += 0.05
+            # Returns early as soon as stop is requested; no polling
+            stop_event.wait(delay)
 
     except KeyboardInterrupt:
         stop_event.set()
         print("\n--- Interrupted by user (Ctrl+C). Stopping conversation... ---")
     finally:
         stop_event.set()
-        # give the listener a moment to exit, then join
-        try:
-            listener.join(timeout=1.0)
-        except Exception:
-            pass
-        # Close log file if we opened one
+        # give the listener a moment to exit, then join (the Windows reader blocks on
+        # the console, so waiting for it would only delay shutdown)
+        if not msvcrt:
+            try:
+                listener.join(timeout=1.0)
+            except Exception:
+                pass
+        # Close log file if we opened one (this flushes whatever is still buffered)
         if log_file:
             try:
-                log_file.close()
+                with log_lock:
+                    log_file.close()
             except Exception:
                 pass
 
@@ -359,6 +508,9 @@ def parse_args():
     p.add_argument('--model-b', type=str, default=None, help='Optional model name for Agent B (overrides env AGENT_B_MODEL)')
     p.add_argument('--max-chars', type=int, default=None, help='Optional max characters per reply')
     p.add_argument('--short-turn', action='store_true', help='Force replies to a single short sentence')
+    p.add_argument('--history-window', type=int, default=8, help='Exchanges of history each agent resends per turn (default 8)')
+    p.add_argument('--quiet', '-q', action='store_true', help='Do not echo the transcript to stdout (use with --log)')
+    p.add_argument('--spellcheck', action='store_true', help='Autocorrect agent replies (slower; needs the autocorrect package)')
     return p.parse_args()
 
 
@@ -406,4 +558,7 @@ if __name__ == '__main__':
         short_turn=args.short_turn,
         model_a=model_a_final,
         model_b=model_b_final,
+        spellcheck=args.spellcheck,
+        history_window=args.history_window,
+        quiet=args.quiet,
     )
@@ -48,14 +48,8 @@ print('Injected fact:', fact)
 # Wait a bit to let worker process
 time.sleep(2.0)
 
-# Dump outputs from app.queue
-outs = []
-try:
-    while True:
-        msg = app.queue.get_nowait()
-        outs.append(msg)
-except Exception:
-    pass
+# Dump outputs from app.queue (a deque): pop what is there now, no Empty exception to end the loop
+outs = [app.queue.popleft() for _ in range(len(app.queue))]
 
 print('\nCaptured outputs:')
 for kind, content in outs:
@@ -64,9 +58,9 @@ for kind, content in outs:
 # Show brain.json
 p = app._brain_path()
 try:
-    with open(p, 'r', encoding='utf-8') as f:
+    with open(p, 'rb') as f:
         print('\nbrain.json content:\n')
-        print(f.read())
+        print(f.read().decode('utf-8'))
 except Exception as e:
     print('Failed to read brain.json:', e)
 
@@ -10,11 +10,13 @@ from gui_ollama_chat import OllamaGUI
 captured = r"c:\Users\nzweb\AppData\Roaming\Code\User\workspaceStorage\ccdf4bc8ab2d6b23669c7dacb835dfe2\GitHub.copilot-chat\chat-session-resources\79355561-a4a9-49da-8214-cb3383d005fe\call_YABmeDs8Ptd2MmW9ohjuhTkL__vscode-1771404033726\content.txt"
 
 def extract_final(path):
-    data = open(path, 'r', encoding='utf-8').read()
+    # one binary read + decode; skips text-mode newline translation on large transcripts
+    with open(path, 'rb') as f:
+        data = f.read().decode('utf-8')
     marker = '== Final Merged Answer =='
-    if marker in data:
-        idx = data.index(marker) + len(marker)
-        final = data[idx:]
+    idx = data.find(marker)
+    if idx != -1:
+        final = data[idx + len(marker):]
         # strip leading/trailing whitespace and markdown/plain artifacts
         final = final.strip('\n \r')
         return final
@@ -2,6 +2,8 @@
 """Simple local simulation of the 3‑phase two-model merge protocol.
 This fakes Model A and Model B responses for demonstration only.
 """
+import re
+
 
 def fake_model(name, payload):
     phase = payload.get('phase')
@@ -38,14 +40,13 @@ def fake_model(name, payload):
     return ''
 
 
+_SENT_RE = re.compile(r'[^.]+')
+
+
 def synthesize(draft_a, draft_b):
-    # Simple deterministic synth: collect unique sentences in order and join.
-    seen = set(); out = []
-    for draft in (draft_a, draft_b):
-        for s in [s.strip() for s in draft.split('.') if s.strip()]:
-            if s not in seen:
-                seen.add(s); out.append(s)
-    return '. '.join(out) + '.'
+    # Simple deterministic synth: unique sentences in first-seen order (dict.fromkeys keeps order), joined.
+    sents = (m.strip() for draft in (draft_a, draft_b) for m in _SENT_RE.findall(draft))
+    return '. '.join(dict.fromkeys(s for s in sents if s)) + '.'
 
 
 def main():
@@ -2,119 +2,158 @@
 """Run the 3-phase merge protocol against real Ollama endpoints configured in gui_config.json or defaults."""
 import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 # ensure project root on path so multi_ollama_chat can be imported
 proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if proj_root not in sys.path:
     sys.path.insert(0, proj_root)
-from multi_ollama_chat import chat_with_ollama
+from multi_ollama_chat import chat_with_ollama, stream_chat_with_ollama
 
 DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), '..', 'gui_config.json')
 
+# <critique>...</critique> / <merge>...</merge> sections of a fused reply; an unclosed last tag runs to the end
+_BLOCK_RE = re.compile(r'<(critique|merge)>(.*?)(?:</\1>|$)', re.S | re.I)
+
+
+# path -> (st_mtime_ns, parsed config); re-parsed only when the file changes
+_CFG_CACHE = {}
+
 
 def load_cfg(path=DEFAULT_CONFIG):
-    cfg = {}
     try:
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                cfg = json.load(f)
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    hit = _CFG_CACHE.get(path)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    try:
+        with open(path, 'rb') as f:
+            cfg = json.load(f)
     except Exception:
         cfg = {}
+    _CFG_CACHE[path] = (mtime, cfg)
     return cfg
 
 
-def run(question, a_url, a_model, b_url, b_model, timeout=30):
-    print('Question:', question)
+# Prompt templates, filled with str.format per run
+# Natural-language instructions (not raw JSON) so models don't echo payloads
+_INIT_INSTR = (
+    "Phase: initial_answer.\n"
+    "Instruction: Give your best answer. Be clear, concise, and factual.\n"
+    "Question: {question}"
+)
+_FUSED_INSTR = (
+    "Phase: critique_and_merge.\n"
+    "Question: {question}\n"
+    "Your answer: {mine}\nOther answer: {other}\n"
+    "Instruction: First, inside <critique></critique>, identify strengths, weaknesses, missing details, and incorrect reasoning in the other answer. Be objective and brief. "
+    "Then, inside <merge></merge>, produce a single combined answer that integrates the best ideas from both answers, fixes errors, and is clearer and more complete than either answer alone."
+)
+_SYNTH_INSTR = (
+    "Phase: synthesize.\n"
+    "Instruction: Synthesize the two drafts into one concise final answer and briefly mention any conflicts you resolved.\n"
+    "Draft A: {draft_a}\nDraft B: {draft_b}"
+)
 
-    # Phase 1: independent answers
-    # Use natural-language instructions (not raw JSON) so models don't echo payloads
-    init_instr = (
-        "Phase: initial_answer.\n"
-        "Instruction: Give your best answer. Be clear, concise, and factual.\n"
-        f"Question: {question}"
-    )
-    messages = [{'role': 'system', 'content': 'You are an assistant answering a question.'}, {'role': 'user', 'content': init_instr}]
+# System messages are shared by every call (never mutated); only the user message is built per call
+_INIT_SYS = {'role': 'system', 'content': 'You are an assistant answering a question.'}
+_FUSED_SYS = {'role': 'system', 'content': 'You are an objective critic and an expert assistant that merges and synthesizes answers.'}
+_SYNTH_SYS = {'role': 'system', 'content': 'You are an expert synthesizer.'}
 
-    try:
-        res_a = chat_with_ollama(a_url, a_model, messages, runtime_options=None, timeout=timeout)
-    except Exception as e:
-        res_a = {'content': f'[ERROR contacting A: {e}]'}
-    try:
-        res_b = chat_with_ollama(b_url, b_model, messages, runtime_options=None, timeout=timeout)
-    except Exception as e:
-        res_b = {'content': f'[ERROR contacting B: {e}]'}
-
-    answer_a = (res_a.get('content','') or '').strip()
-    answer_b = (res_b.get('content','') or '').strip()
-
-    print('\n== Initial Answers ==')
-    print('\n-- Model A --\n', answer_a)
-    print('\n-- Model B --\n', answer_b)
-
-    # Phase 2: critiques
-    crit_a_text = (
-        "Phase: critique.\n"
-        "Instruction: Identify strengths, weaknesses, missing details, and incorrect reasoning in the other model's answer. Be objective and brief.\n"
-        f"Your answer: {answer_a}\nOther answer: {answer_b}"
-    )
-    messages_a = [{'role':'system','content':'You are an objective critic.'}, {'role':'user','content': crit_a_text}]
-    crit_b_text = (
-        "Phase: critique.\n"
-        "Instruction: Identify strengths, weaknesses, missing details, and incorrect reasoning in the other model's answer. Be objective and brief.\n"
-        f"Your answer: {answer_b}\nOther answer: {answer_a}"
-    )
-    messages_b = [{'role':'system','content':'You are an objective critic.'}, {'role':'user','content': crit_b_text}]
 
-    try:
-        crit_a = chat_with_ollama(a_url, a_model, messages_a, timeout=timeout).get('content','').strip()
-    except Exception as e:
-        crit_a = f'[ERROR critique A: {e}]'
-    try:
-        crit_b = chat_with_ollama(b_url, b_model, messages_b, timeout=timeout).get('content','').strip()
-    except Exception as e:
-        crit_b = f'[ERROR critique B: {e}]'
-
-    print('\n== Critiques ==')
-    print('\n-- Critique A --\n', crit_a)
-    print('\n-- Critique B --\n', crit_b)
-
-    # Phase 3: final merge drafts
-    merge_text = (
-        "Phase: final_merge.\n"
-        f"Question: {question}\n"
-        f"Answer A: {answer_a}\n"
-        f"Answer B: {answer_b}\n"
-        f"Critique A: {crit_a}\n"
-        f"Critique B: {crit_b}\n"
-        "Instruction: Produce a single combined answer that integrates the best ideas from both models, fixes errors, and is clearer and more complete than either answer alone."
-    )
-    messages_merge = [{'role':'system','content':'You are an expert assistant that merges and synthesizes answers.'}, {'role':'user','content': merge_text}]
+def _msgs(sys_msg, user_content):
+    return [sys_msg, {'role': 'user', 'content': user_content}]
 
+
+def merge_closed(text):
+    # Only the tail can hold a freshly streamed closing tag
+    return '</merge>' in text[-32:].lower()
+
+
+def ask(url, model, messages, timeout, label, until=None):
+    """One chat call; returns the stripped reply text, or an '[ERROR <label>: ...]' marker.
+
+    With ``until``, the reply is streamed and reading stops as soon as ``until(text)`` is true.
+    """
     try:
-        draft_a = chat_with_ollama(a_url, a_model, messages_merge, timeout=timeout).get('content','').strip()
-    except Exception as e:
-        draft_a = f'[ERROR merge draft A: {e}]'
-    try:
-        draft_b = chat_with_ollama(b_url, b_model, messages_merge, timeout=timeout).get('content','').strip()
+        if until is not None:
+            res = stream_chat_with_ollama(url, model, messages, timeout=timeout, until=until)
+        else:
+            res = chat_with_ollama(url, model, messages, timeout=timeout)
+        return (res.get('content', '') or '').strip()
     except Exception as e:
-        draft_b = f'[ERROR merge draft B: {e}]'
+        return f'[ERROR {label}: {e}]'
 
-    print('\n== Merge Drafts ==')
-    print('\n-- Draft A --\n', draft_a)
-    print('\n-- Draft B --\n', draft_b)
 
-    # Final synthesis: ask model A to synthesize drafts
-    synth_text = (
-        "Phase: synthesize.\n"
-        "Instruction: Synthesize the two drafts into one concise final answer and briefly mention any conflicts you resolved.\n"
-        f"Draft A: {draft_a}\nDraft B: {draft_b}"
-    )
-    messages_synth = [{'role':'system','content':'You are an expert synthesizer.'}, {'role':'user','content': synth_text}]
+def split_blocks(text):
+    """Return (critique, merge) from a fused reply; untagged text (e.g. an error marker) is used for both."""
+    blocks = {k.lower(): v.strip() for k, v in _BLOCK_RE.findall(text)}
+    if not blocks:
+        return text, text
+    return blocks.get('critique', ''), blocks.get('merge') or text
+
+
+def run_merge(question, a_url, a_model, b_url, b_model, timeout=30, on_phase=None):
+    """Run the merge protocol and return the final merged answer.
+
+    ``on_phase(phase, text_a, text_b)`` is called after 'initial', 'critique' and 'draft'.
+    """
+    # A and B calls within a phase are independent: A runs on the pool while B runs here
+    pool = ThreadPoolExecutor(max_workers=1)
+
+    def ask_both(messages_a, messages_b, label_a, label_b, until=None):
+        fut_a = pool.submit(ask, a_url, a_model, messages_a, timeout, label_a, until)
+        out_b = ask(b_url, b_model, messages_b, timeout, label_b, until)
+        return fut_a.result(), out_b
+
     try:
-        final = chat_with_ollama(a_url, a_model, messages_synth, timeout=timeout).get('content','').strip()
-    except Exception as e:
-        final = draft_a or draft_b or f'[ERROR synth: {e}]'
+        # Phase 1: independent answers
+        messages = _msgs(_INIT_SYS, _INIT_INSTR.format(question=question))
+        answer_a, answer_b = ask_both(messages, messages, 'contacting A', 'contacting B')
+        if on_phase:
+            on_phase('initial', answer_a, answer_b)
+
+        # Phase 2+3: each side critiques the other answer and drafts the merge in one call
+        # Streamed so generation is cut off once the merge block closes; anything after it is never used
+        out_a, out_b = ask_both(
+            _msgs(_FUSED_SYS, _FUSED_INSTR.format(question=question, mine=answer_a, other=answer_b)),
+            _msgs(_FUSED_SYS, _FUSED_INSTR.format(question=question, mine=answer_b, other=answer_a)),
+            'critique/merge A', 'critique/merge B', until=merge_closed)
+    finally:
+        pool.shutdown(wait=False)
+    crit_a, draft_a = split_blocks(out_a)
+    crit_b, draft_b = split_blocks(out_b)
+    if on_phase:
+        on_phase('critique', crit_a, crit_b)
+        on_phase('draft', draft_a, draft_b)
 
+    # Final synthesis: ask model A to synthesize drafts
+    final = ask(a_url, a_model, _msgs(_SYNTH_SYS, _SYNTH_INSTR.format(draft_a=draft_a, draft_b=draft_b)), timeout, 'synth')
+    if not final or final.startswith('[ERROR'):
+        final = draft_a or draft_b or final or '[ERROR: no merged output]'
+    return final
+
+
+_PHASE_HEADINGS = {
+    'initial': ('Initial Answers', 'Model A', 'Model B'),
+    'critique': ('Critiques', 'Critique A', 'Critique B'),
+    'draft': ('Merge Drafts', 'Draft A', 'Draft B'),
+}
+
+
+def print_phase(phase, text_a, text_b):
+    title, label_a, label_b = _PHASE_HEADINGS[phase]
+    print(f'\n== {title} ==')
+    print(f'\n-- {label_a} --\n', text_a)
+    print(f'\n-- {label_b} --\n', text_b)
+
+
+def run(question, a_url, a_model, b_url, b_model, timeout=30):
+    print('Question:', question)
+    final = run_merge(question, a_url, a_model, b_url, b_model, timeout=timeout, on_phase=print_phase)
     print('\n== Final Merged Answer ==\n')
     print(final)
 
@@ -16,8 +16,8 @@ samples = [
     "I work as a teacher",
     "I love pizza",
 ]
-for s in samples:
-    app._add_facts_from_text(s)
+# One batch: facts from all samples are saved to brain.json in a single write
+app._add_facts_from_texts(samples)
 
 print('Memory summary:', app._get_memory_summary())
 
@@ -1,4 +1,4 @@
-import os, sys, time
+import os, sys
 proj_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if proj_root not in sys.path:
     sys.path.insert(0, proj_root)
@@ -8,29 +8,30 @@ from gui_ollama_chat import OllamaGUI
 if __name__ == '__main__':
     r = tk.Tk()
     app = OllamaGUI(r)
+    # Capture merged_final as it is queued (the GUI's own poll also drains app.queue),
+    # and let Tk's mainloop idle until it arrives or 120s pass. The hook goes in before
+    # the run starts so a fast result can't be queued ahead of it
+    got = {}
+    put = app.queue.put
+    def capture(item):
+        if item[0] == 'merged_final':
+            got.setdefault('final', item[1])
+        put(item)
+    app.queue.put = capture
     # start live merge (will create progress Toplevel)
     app._on_run_live_merge()
-    # wait for merged_final in queue (timeout 120s)
-    start = time.time()
-    final = None
+    def check():
+        if 'final' in got:
+            r.quit()
+        else:
+            r.after(50, check)
+    r.after(50, check)
+    r.after(120000, r.quit)
     try:
-        while time.time() - start < 120:
-            # process tkinter events so Toplevel and updates work
-            try:
-                r.update()
-            except Exception:
-                pass
-            try:
-                kind, text = app.queue.get_nowait()
-                if kind == 'merged_final':
-                    final = text
-                    break
-            except Exception:
-                # no item yet
-                time.sleep(0.1)
-                continue
+        r.mainloop()
     except KeyboardInterrupt:
         pass
+    final = got.get('final')
     if final is None:
         print('ERROR: no merged_final received in 120s')
     else: